@@ -0,0 +1,260 @@
+"""
+End-to-end benchmark of an event update, against a local mock of the SMX API
+
+Times each phase of what girlpoc_jan_26.py does (catalog load, tournament build, eligibility,
+    score fetch, standings, reporting) on synthetic events of growing size, then the same
+    update again warm: with every score already in the local store, a new chart is released
+    and a few new scores are played, some on it, and picked up by incremental `updated_at`
+    syncs. The warm update fails if the new chart's scores are not counted. Nothing touches
+    the real API, the repo's data/ folder, or Google Sheets: results go to a FakeSpreadsheet,
+    whose calls, cells, bytes and simulated time are reported with the rest.
+
+Usage:
+    python -m benchmarks.bench_pipeline --scales 100:10000,1000:100000 --latency 0.02
+"""
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+
+from benchmarks.fake_sheets import FakeSheetsClient
+from benchmarks.mock_smx_api import (
+    MockSMXApi,
+    MockSMXServer,
+    generate_dataset,
+    generate_new_chart,
+    generate_new_scores,
+)
+from src.Eligibility import EligibilityConfig
+from src.Metrics import Metrics
+from src.RateLimiter import RateLimiter
+from src.ReportWriter import ReportWriter
+from src.ScoreFetcher import ScoreFetcher
+from src.ScorePool import ScorePool
+from src.Tournament import (
+    GauntletTournament,
+    LadderTournament,
+    make_eligibility_spreadsheet_for_gauntlet_tournaments,
+)
+
+START = datetime(2026, 1, 30, 5, tzinfo=UTC)
+END = datetime(2026, 2, 22, 5, tzinfo=UTC)
+GAUNTLETS = [  # (name, difficulty name, number of charts)
+    ("Hard", "hard", 8),
+    ("Wild", "wild", 8),
+]
+
+
+def build_tournaments(
+    score_fetcher: ScoreFetcher,
+    entrant_names: list[str],
+) -> tuple[ScorePool, list[GauntletTournament], list[LadderTournament]]:
+    """
+    Gauntlets and a ladder over the synthetic catalog, sharing one ScorePool like an Event
+    """
+    score_pool = ScorePool(score_fetcher)
+    gauntlets = []
+    for index, (name, difficulty_name, num_charts) in enumerate(GAUNTLETS):
+        charts = [
+            chart for chart in score_fetcher.charts if chart.difficulty_name == difficulty_name
+        ][index * num_charts:(index + 1) * num_charts]
+        songs_by_id = {song.id: song for song in score_fetcher.songs}
+        gauntlet = GauntletTournament(
+            name=name,
+            start_date=START,
+            end_date=END,
+            attempts_to_count=2,
+            ineligible_requirements=[EligibilityConfig(difficulty=20, score=95_000, count=3)],
+            score_fetcher=score_fetcher,
+            score_pool=score_pool,
+        )
+        gauntlet.filter_songs_and_charts([
+            {
+                "title": songs_by_id[chart.song_id].title,
+                "difficulty": chart.difficulty,
+                "difficulty_name": chart.difficulty_name,
+            }
+            for chart in charts
+        ])
+        gauntlet.load_entrants(entrant_names)
+        gauntlets.append(gauntlet)
+    ladder = LadderTournament(
+        name="Full Ladder",
+        start_date=START,
+        end_date=END,
+        restrict_to_difficulties=["full"],
+        score_fetcher=score_fetcher,
+        score_pool=score_pool,
+    )
+    ladder.load_entrants(entrant_names)
+    return score_pool, gauntlets, [ladder]
+
+
+def run_scale(
+    num_entrants: int,
+    num_scores: int,
+    *,
+    latency: float,
+    jitter: float,
+    rate: float,
+    concurrency: int,
+    sheets_latency: float,
+    new_scores: int,
+) -> dict:
+    """
+    Benchmark one cold and one warm event update at the given size
+
+    The warm update syncs the catalog and every entrant again, finding the `new_scores` played
+        since the cold one, plus a tenth as many on a chart released since
+
+    :return: Seconds and API requests per phase, plus totals
+    :rtype: dict
+    """
+    dataset = generate_dataset(entrants=num_entrants, scores=num_scores, start=START, end=END)
+    entrant_names = [f"entrant{gamer_id:04d}" for gamer_id in range(1, num_entrants + 1)]
+    api = MockSMXApi(dataset, latency=latency, jitter=jitter)
+    sheets_client = FakeSheetsClient(latency=sheets_latency)
+    metrics = Metrics()
+    phases: dict[str, dict] = {}
+
+    @contextlib.contextmanager
+    def phase(name: str):
+        requests = api.requests
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # tournaments report progress per entrant
+            yield
+        phases[name] = {
+            "seconds": round(time.perf_counter() - started, 4),
+            "requests": api.requests - requests,
+        }
+
+    with MockSMXServer(api) as server, tempfile.TemporaryDirectory() as data_path:
+        with phase("catalog"):
+            score_fetcher = ScoreFetcher(
+                api_url=server.url,
+                data_path=Path(data_path),
+                max_concurrency=concurrency,
+                rate_limiter=RateLimiter(rate=rate, burst=concurrency, max_concurrency=concurrency),
+                score_sync_interval=0,  # so the warm update really syncs
+                metrics=metrics,
+            )
+        try:
+            with phase("build"):
+                score_pool, gauntlets, ladders = build_tournaments(score_fetcher, entrant_names)
+            with phase("eligibility"):
+                for gauntlet in gauntlets:
+                    gauntlet.resolve_eligibility()
+            with phase("fetch"):
+                score_pool.fetch()
+            with phase("compute"):
+                for tournament in gauntlets + ladders:
+                    tournament.get_all_scores()
+            with phase("report"):
+                spreadsheet = sheets_client.open_by_key("bench")
+                report_writer = ReportWriter(cache_path=Path(data_path) / "report_cache.json", metrics=metrics)
+                make_eligibility_spreadsheet_for_gauntlet_tournaments(
+                    result_spreadsheet=spreadsheet,
+                    tournaments=gauntlets,
+                    report_writer=report_writer,
+                )
+                for tournament in gauntlets + ladders:
+                    tournament.stage_results(report_writer)
+                report_writer.flush(spreadsheet)
+            api.add_scores(generate_new_scores(dataset, new_scores, start=START, end=END))
+            _, new_chart = generate_new_chart(dataset)
+            new_chart_scores = generate_new_scores(
+                dataset, max(new_scores // 10, 1), start=START, end=END, charts=[new_chart], seed=2,
+            )
+            api.add_scores(new_chart_scores)
+            with phase("warm_update"):
+                score_fetcher.refresh_catalog()
+                score_pool.fetch()
+                for tournament in gauntlets + ladders:
+                    tournament.get_all_scores()
+            _check_counted(ladders, new_chart, new_chart_scores)
+        finally:
+            score_fetcher.close()
+
+    cold_phases = [name for name in phases if name != "warm_update"]
+    return {
+        "entrants": num_entrants,
+        "scores": num_scores,
+        "phases": phases,
+        "cold_seconds": round(sum(phases[name]["seconds"] for name in cold_phases), 4),
+        "cold_requests": sum(phases[name]["requests"] for name in cold_phases),
+        "rows_sent": api.rows_sent,
+        "bytes_sent": api.bytes_sent,
+        "sheets": sheets_client.summary(),
+        "counters": metrics.counters,
+    }
+
+
+def print_result(result: dict):
+    print(f"\n{result['entrants']} entrants, {result['scores']} scores")
+    print(f"{'phase':<14}{'seconds':>10}{'requests':>10}")
+    for name, timing in result["phases"].items():
+        print(f"{name:<14}{timing['seconds']:>10.3f}{timing['requests']:>10}")
+    print(f"{'cold total':<14}{result['cold_seconds']:>10.3f}{result['cold_requests']:>10}")
+    print(f"{result['rows_sent']} rows, {result['bytes_sent'] / 1e6:.1f} MB served")
+    sheets = result["sheets"]
+    print(
+        f"Sheets: {sheets['calls']} calls ({sheets['writes']} writes), {sheets['cells']} cells, "
+        f"{sheets['bytes'] / 1e3:.1f} KB, {sheets['simulated_seconds']:.1f}s simulated"
+    )
+
+
+def _check_counted(ladders: list[LadderTournament], chart: dict, raw_scores: list[dict]):
+    """
+    Make sure every entrant with a score on `chart` has it among their ladder scores
+    """
+    for ladder in ladders:
+        for entrant_name in {raw_score["gamer"]["username"] for raw_score in raw_scores}:
+            if not any(score.song_chart_id == chart["id"] for score, _ in ladder.standings.scores(entrant_name)):
+                raise RuntimeError(f"{ladder.name}: {entrant_name}'s score on new chart {chart['id']} was not counted")
+
+
+def _parse_scales(value: str) -> list[tuple[int, int]]:
+    scales = []
+    for scale in value.split(","):
+        entrants, scores = scale.split(":")
+        scales.append((int(entrants), int(scores)))
+    return scales
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark an event update against a local mock API")
+    parser.add_argument(
+        "--scales",
+        type=_parse_scales,
+        default=_parse_scales("100:10000,1000:100000"),
+        help="comma separated entrants:scores sizes to run",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many random extra seconds per response")
+    parser.add_argument("--rate", type=float, default=1000.0, help="requests per second allowed by the rate limiter")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight at once")
+    parser.add_argument("--sheets-latency", type=float, default=0.2, help="simulated seconds per Sheets call")
+    parser.add_argument("--new-scores", type=int, default=50, help="scores played before the warm update")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for num_entrants, num_scores in args.scales:
+        result = run_scale(
+            num_entrants,
+            num_scores,
+            latency=args.latency,
+            jitter=args.jitter,
+            rate=args.rate,
+            concurrency=args.concurrency,
+            sheets_latency=args.sheets_latency,
+            new_scores=args.new_scores,
+        )
+        print_result(result)
+        results.append(result)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
@@ -0,0 +1,370 @@
+"""
+Local stand-in for the Google Sheets calls made by the report path
+
+FakeSpreadsheet and FakeWorksheet answer the gspread calls we use (values_batch_update,
+    values_batch_get, batch_update, fetch_sheet_metadata, worksheets, worksheet), so
+    ReportWriter and the real gspread_formatting helpers run on them unchanged.
+
+Every call is recorded on the FakeSheetsClient with the cells and bytes it sent, and a
+    simulated latency that advances a simulated clock. Read and write requests are held to
+    per-minute quotas like the Sheets API's per-user limits: a call over quota either waits
+    (on the simulated clock) for the window to free up, or raises SheetsQuotaError.
+
+Usage:
+    client = FakeSheetsClient(write_quota=60)
+    spreadsheet = client.open_by_key("results")
+    tournament.report_results(spreadsheet)
+    print(client.summary())
+"""
+import json
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+
+WRITE_METHODS = {"values_batch_update", "batch_update", "worksheet.batch_update"}
+_CELL_RE = re.compile(r"^([A-Za-z]*)(\d*)$")
+
+
+class SheetsQuotaError(Exception):
+    """
+    A call went over the per-minute quota, like the Sheets API's 429 RESOURCE_EXHAUSTED
+    """
+    def __init__(self, method: str, kind: str, quota: int):
+        self.method = method
+        self.kind = kind
+        self.quota = quota
+        super().__init__(f"{method}: over the {kind} quota of {quota} requests per minute")
+
+
+@dataclass(slots=True)
+class SheetsCall:
+    method: str  # gspread method name, e.g. "values_batch_update"
+    ranges: list[str]
+    cells: int  # values sent, not counting None (left as is)
+    bytes: int  # size of the JSON request body
+    latency: float  # simulated seconds
+    quota_wait: float  # simulated seconds spent waiting for the quota window
+    at: float  # simulated clock when the call was sent
+
+
+class FakeSheetsClient:
+    """
+    Records every call made on its spreadsheets, and enforces the per-minute quotas
+
+    :param latency: Simulated seconds per call
+    :param latency_per_kb: Extra simulated seconds per KB of request body
+    :param write_quota: Write requests allowed per minute
+    :param read_quota: Read requests allowed per minute
+    :param wait_on_quota: Wait for the quota window instead of raising SheetsQuotaError
+    :param realtime: Actually sleep for the simulated latency and quota waits
+    """
+    def __init__(
+        self,
+        *,
+        latency: float = 0.2,
+        latency_per_kb: float = 0.002,
+        write_quota: int = 60,
+        read_quota: int = 60,
+        wait_on_quota: bool = True,
+        realtime: bool = False,
+    ):
+        self.latency = latency
+        self.latency_per_kb = latency_per_kb
+        self.quotas = {"write": write_quota, "read": read_quota}
+        self.wait_on_quota = wait_on_quota
+        self.realtime = realtime
+        self.clock = 0.0  # simulated seconds since the client was created
+        self.calls: list[SheetsCall] = []
+        self._spreadsheets: dict[str, FakeSpreadsheet] = {}
+        self._recent: dict[str, deque[float]] = {"write": deque(), "read": deque()}
+
+    def open_by_key(self, key: str, create_worksheets: bool = True) -> "FakeSpreadsheet":
+        """
+        Spreadsheet with the given key, created empty on first use
+        """
+        if key not in self._spreadsheets:
+            self._spreadsheets[key] = FakeSpreadsheet(self, key, create_worksheets=create_worksheets)
+        return self._spreadsheets[key]
+
+    def summary(self) -> dict:
+        """
+        Call count, cells, bytes and simulated seconds, in total and per method
+        """
+        by_method: dict[str, dict] = {}
+        for call in self.calls:
+            method = by_method.setdefault(call.method, {"calls": 0, "cells": 0, "bytes": 0})
+            method["calls"] += 1
+            method["cells"] += call.cells
+            method["bytes"] += call.bytes
+        return {
+            "calls": len(self.calls),
+            "writes": sum(1 for call in self.calls if call.method in WRITE_METHODS),
+            "cells": sum(call.cells for call in self.calls),
+            "bytes": sum(call.bytes for call in self.calls),
+            "simulated_seconds": round(self.clock, 3),
+            "quota_wait_seconds": round(sum(call.quota_wait for call in self.calls), 3),
+            "by_method": by_method,
+        }
+
+    def reset(self):
+        """
+        Forget recorded calls and quota usage, keeping spreadsheet contents
+        """
+        self.clock = 0.0
+        self.calls = []
+        self._recent = {"write": deque(), "read": deque()}
+
+    def record(self, method: str, body, ranges: list[str], cells: int = 0) -> SheetsCall:
+        """
+        Account for one API call, waiting for or raising on the quota first
+
+        :raises SheetsQuotaError: If the call is over quota and `wait_on_quota` is off
+        """
+        kind = "write" if method in WRITE_METHODS else "read"
+        quota_wait = self._take_quota(method, kind)
+        size = len(json.dumps(body))
+        latency = self.latency + self.latency_per_kb * size / 1024
+        call = SheetsCall(method, ranges, cells, size, latency, quota_wait, self.clock)
+        self._advance(latency)
+        self.calls.append(call)
+        return call
+
+    # private helpers
+    def _take_quota(self, method: str, kind: str) -> float:
+        recent = self._recent[kind]
+        while recent and recent[0] <= self.clock - 60:
+            recent.popleft()
+        waited = 0.0
+        if len(recent) >= self.quotas[kind]:
+            if not self.wait_on_quota:
+                raise SheetsQuotaError(method, kind, self.quotas[kind])
+            waited = recent[0] + 60 - self.clock
+            self._advance(waited)
+            recent.popleft()
+        recent.append(self.clock)
+        return waited
+
+    def _advance(self, seconds: float):
+        self.clock += seconds
+        if self.realtime:
+            time.sleep(seconds)
+
+
+class FakeSpreadsheet:
+    """
+    In-memory spreadsheet answering the gspread Spreadsheet calls we use
+
+    :param create_worksheets: Create a worksheet the first time it is used, like the result
+        spreadsheet's tabs already existing. If False, only add_worksheet creates them.
+    """
+    def __init__(self, client: FakeSheetsClient, key: str, title: str = "Results", *, create_worksheets: bool = True):
+        self.client = client
+        self.id = key
+        self.title = title
+        self.create_worksheets = create_worksheets
+        self._properties = {"title": title, "locale": "en_US", "timeZone": "Etc/GMT"}  # read by gspread_formatting
+        self._worksheets: dict[str, FakeWorksheet] = {}
+
+    def add_worksheet(self, title: str, rows: int = 1000, cols: int = 26) -> "FakeWorksheet":
+        worksheet = FakeWorksheet(self, len(self._worksheets), title, rows, cols)
+        self._worksheets[title] = worksheet
+        return worksheet
+
+    def worksheets(self, exclude_hidden: bool = False) -> list["FakeWorksheet"]:
+        self.client.record("worksheets", {}, [])
+        return list(self._worksheets.values())
+
+    def worksheet(self, title: str) -> "FakeWorksheet":
+        """
+        :raises gspread.exceptions.WorksheetNotFound: If there is no worksheet with that title
+        """
+        from gspread.exceptions import WorksheetNotFound
+
+        self.client.record("worksheet", {}, [title])
+        if title not in self._worksheets:
+            if not self.create_worksheets:
+                raise WorksheetNotFound(title)
+            return self.add_worksheet(title)
+        return self._worksheets[title]
+
+    def values_batch_update(self, body: dict) -> dict:
+        ranges = [value_range["range"] for value_range in body.get("data", [])]
+        cells = sum(
+            value is not None
+            for value_range in body.get("data", [])
+            for row in value_range["values"]
+            for value in row
+        )
+        self.client.record("values_batch_update", body, ranges, cells)
+        for value_range in body.get("data", []):
+            title, start, _ = _parse_range(value_range["range"])
+            self._existing_worksheet(title).write(start, value_range["values"])
+        return {"spreadsheetId": self.id, "totalUpdatedCells": cells}
+
+    def values_batch_get(self, ranges: list[str], params: dict | None = None) -> dict:
+        self.client.record("values_batch_get", {"ranges": ranges}, ranges)
+        value_ranges = []
+        for range_name in ranges:
+            title, start, end = _parse_range(range_name)
+            value_range = {"range": range_name, "majorDimension": "ROWS"}
+            if title in self._worksheets:
+                values = self._worksheets[title].read(start, end)
+                if values:
+                    value_range["values"] = values
+            value_ranges.append(value_range)
+        return {"spreadsheetId": self.id, "valueRanges": value_ranges}
+
+    def batch_update(self, body: dict) -> dict:
+        self.client.record("batch_update", body, [])
+        replies = []
+        for request in _flatten(body.get("requests", [])):
+            (kind, payload), = request.items()
+            if kind == "updateSheetProperties":
+                properties = payload["properties"]
+                worksheet = self._worksheet_by_id(properties["sheetId"])
+                worksheet.grid_properties.update(properties.get("gridProperties", {}))
+            elif kind == "addConditionalFormatRule":
+                sheet_id = payload["rule"]["ranges"][0]["sheetId"]
+                self._worksheet_by_id(sheet_id).conditional_formats.insert(payload["index"], payload["rule"])
+            elif kind == "deleteConditionalFormatRule":
+                del self._worksheet_by_id(payload["sheetId"]).conditional_formats[payload["index"]]
+            # other requests (filters, cell formats...) are only recorded
+            replies.append({})
+        return {"spreadsheetId": self.id, "replies": replies}
+
+    def fetch_sheet_metadata(self, params: dict | None = None) -> dict:
+        self.client.record("fetch_sheet_metadata", params or {}, [])
+        return {
+            "spreadsheetId": self.id,
+            "properties": dict(self._properties),
+            "sheets": [worksheet.metadata() for worksheet in self._worksheets.values()],
+        }
+
+    # private helpers
+    def _existing_worksheet(self, title: str) -> "FakeWorksheet":
+        # a write to a missing worksheet is an API error, not a WorksheetNotFound
+        if title not in self._worksheets:
+            if not self.create_worksheets:
+                raise KeyError(f"Unable to parse range: {title!r} has no worksheet")
+            return self.add_worksheet(title)
+        return self._worksheets[title]
+
+    def _worksheet_by_id(self, sheet_id: int) -> "FakeWorksheet":
+        for worksheet in self._worksheets.values():
+            if worksheet.id == sheet_id:
+                return worksheet
+        raise KeyError(f"No worksheet with sheetId {sheet_id}")
+
+
+class FakeWorksheet:
+    """
+    In-memory worksheet, with the cell values and properties written to it so far
+    """
+    def __init__(self, spreadsheet: FakeSpreadsheet, sheet_id: int, title: str, rows: int, cols: int):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.title = title
+        self.grid_properties = {"rowCount": rows, "columnCount": cols}
+        self.conditional_formats: list[dict] = []
+        self._cells: dict[tuple[int, int], str] = {}  # (row, col), 1-based
+
+    @property
+    def row_count(self) -> int:
+        return self.grid_properties["rowCount"]
+
+    @property
+    def col_count(self) -> int:
+        return self.grid_properties["columnCount"]
+
+    def batch_update(self, data: list[dict], **kwargs) -> dict:
+        body = {"data": data}
+        self.spreadsheet.client.record("worksheet.batch_update", body, [])
+        return {"spreadsheetId": self.spreadsheet.id}
+
+    def get_all_values(self) -> list[list[str]]:
+        """
+        Every written cell, as gspread returns them (no API call is recorded)
+        """
+        return self.read((1, 1), (None, None))
+
+    def metadata(self) -> dict:
+        return {
+            "properties": {
+                "sheetId": self.id,
+                "title": self.title,
+                "index": self.id,
+                "sheetType": "GRID",
+                "gridProperties": dict(self.grid_properties),
+            },
+            "conditionalFormats": list(self.conditional_formats),
+        }
+
+    def write(self, start: tuple[int, int], values: list[list]):
+        start_row, start_col = start
+        for row_offset, row in enumerate(values):
+            for col_offset, value in enumerate(row):
+                if value is None:
+                    continue  # None leaves the cell as is
+                cell = (start_row + row_offset, start_col + col_offset)
+                if value == "":
+                    self._cells.pop(cell, None)
+                else:
+                    self._cells[cell] = str(value)
+        if self._cells:
+            self.grid_properties["rowCount"] = max(self.row_count, max(row for row, _ in self._cells))
+            self.grid_properties["columnCount"] = max(self.col_count, max(col for _, col in self._cells))
+
+    def read(self, start: tuple[int, int], end: tuple[int | None, int | None]) -> list[list[str]]:
+        """
+        Cell values within the range, trimmed of trailing empty rows and cells like the API
+        """
+        start_row, start_col = start
+        end_row, end_col = end
+        cells = [
+            (row, col) for row, col in self._cells
+            if row >= start_row and col >= start_col
+            and (end_row is None or row <= end_row) and (end_col is None or col <= end_col)
+        ]
+        if not cells:
+            return []
+        last_row = max(row for row, _ in cells)
+        values = []
+        for row in range(start_row, last_row + 1):
+            row_cols = [col for r, col in cells if r == row]
+            last_col = max(row_cols, default=start_col - 1)
+            values.append([self._cells.get((row, col), "") for col in range(start_col, last_col + 1)])
+        return values
+
+
+def _flatten(requests: list) -> list[dict]:
+    # gspread_formatting's batch updater sends one list of requests per queued call
+    flat = []
+    for request in requests:
+        flat.extend(_flatten(request) if isinstance(request, list) else [request])
+    return flat
+
+
+def _parse_range(range_name: str) -> tuple[str, tuple[int, int], tuple[int | None, int | None]]:
+    """
+    Worksheet title, start (row, col) and end (row, col) of an A1 range like 'Sheet'!A1:ZZ
+
+    Open ends (a column-only or missing end) are None
+    """
+    title, _, cells = range_name.rpartition("!")
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    start, _, end = cells.partition(":")
+    start_row, start_col = _parse_cell(start)
+    end_row, end_col = _parse_cell(end) if end else (None, None)
+    return title, (start_row or 1, start_col or 1), (end_row, end_col)
+
+
+def _parse_cell(cell: str) -> tuple[int | None, int | None]:
+    letters, digits = _CELL_RE.match(cell).groups()
+    col = None
+    if letters:
+        col = 0
+        for letter in letters.upper():
+            col = col * 26 + ord(letter) - ord("A") + 1
+    return (int(digits) if digits else None), col
@@ -0,0 +1,320 @@
+"""
+Local stand-in for the SMX.573.no API, serving synthetic songs, charts and scores
+
+Answers /songs, /charts and /scores like the real API: the `params` query string holds a
+    JSON object of filters (dotted field paths, with a value, a list of allowed values, or a
+    dict of gt/gte/lt/lte bounds), plus `_skip`/`_take` paging (at most 100 rows),
+    `_sort`/`_order` and `_group_by` (best score per group).
+"""
+import asyncio
+import json
+import random
+import threading
+from datetime import datetime, timedelta, UTC
+
+from aiohttp import web
+
+from src.ScoreStore import to_timestamp
+
+DIFFICULTIES = [  # (difficulty name, lowest and highest block rating)
+    ("beginner", 1, 3),
+    ("easy", 3, 7),
+    ("hard", 8, 16),
+    ("wild", 16, 23),
+    ("full", 12, 26),
+]
+MAX_TAKE = 100
+
+
+def _iso(value: datetime) -> str:
+    return value.astimezone(UTC).isoformat().replace("+00:00", "Z")
+
+
+def generate_dataset(
+    *,
+    entrants: int = 1000,
+    scores: int = 100_000,
+    songs: int = 300,
+    start: datetime = datetime(2026, 1, 30, 5, tzinfo=UTC),
+    end: datetime = datetime(2026, 2, 22, 5, tzinfo=UTC),
+    history_days: int = 90,
+    seed: int = 0,
+) -> dict[str, list[dict]]:
+    """
+    Synthetic songs, charts and scores shaped like API rows
+
+    Entrants are named `entrant0001`... and play with a long-tailed volume, so a few grind
+        thousands of scores while most play a handful. About a third of the scores fall before
+        `start`, as pre-event history for eligibility checks.
+    """
+    rng = random.Random(seed)
+    created = _iso(start - timedelta(days=history_days * 2))
+    song_rows = [
+        {
+            "_id": str(song_id), "allow_edits": False, "artist": f"Artist {song_id % 37}",
+            "bpm": str(rng.randrange(90, 200)), "cover": "", "cover_path": "", "cover_thumb": "",
+            "created_at": created, "extra": {}, "first_beat": 0, "first_ms": 0,
+            "game_song_id": song_id, "genre": "", "id": song_id, "is_enabled": True, "label": "",
+            "last_beat": 0, "last_ms": 0, "release_date": created, "subtitle": "",
+            "timing_bpms": "", "timing_offset_ms": 0, "timing_stops": "",
+            "title": f"Song {song_id:04d}", "updated_at": created, "website": "",
+        }
+        for song_id in range(1, songs + 1)
+    ]
+    chart_rows = []
+    for song in song_rows:
+        for difficulty_name, lowest, highest in DIFFICULTIES:
+            difficulty = rng.randint(lowest, highest)
+            chart_id = len(chart_rows) + 1
+            chart_rows.append({
+                "_id": chart_id, "created_at": created, "difficulty": difficulty,
+                "difficulty_display": difficulty_name, "difficulty_id": 0,
+                "difficulty_name": difficulty_name, "game_difficulty_id": 0, "graph": [0.5] * 20,
+                "id": chart_id, "is_enabled": True, "meter": difficulty, "pass_count": 0,
+                "play_count": 0, "song_id": song["id"], "steps_author": "", "steps_index": 0,
+                "updated_at": created,
+            })
+
+    gamer_rows = [
+        {
+            "_id": gamer_id, "country": "", "description": "", "hex_color": "", "id": gamer_id,
+            "picture_path": "", "private": False, "published_edits": 0, "rival": 0,
+            "username": f"entrant{gamer_id:04d}",
+        }
+        for gamer_id in range(1, entrants + 1)
+    ]
+    weights = [rng.paretovariate(1.2) for _ in gamer_rows]
+    history_start = start - timedelta(days=history_days)
+    span = (end - history_start).total_seconds()
+    score_rows = []
+    for score_id, gamer in enumerate(rng.choices(gamer_rows, weights, k=scores), start=1):
+        chart = rng.choice(chart_rows)
+        created_at = _iso(history_start + timedelta(seconds=rng.random() * span))
+        score = min(100_000, int(rng.betavariate(8, 1) * 100_000))
+        score_rows.append({
+            "_id": score_id, "calories": 0, "chart": chart, "cleared": score > 60_000,
+            "created_at": created_at, "early": 0, "flags": 0, "full_combo": score > 99_000,
+            "gamer": gamer, "gamer_id": gamer["id"], "global_flags": 0, "grade": 0, "green": 0,
+            "id": score_id, "late": 0, "max_combo": 0, "misses": 0, "music_speed": 0,
+            "perfect1": 0, "perfect2": 0, "personal_best": 0, "personal_best_previous": 0,
+            "red": 0, "score": score, "side": "", "song": song_rows[chart["song_id"] - 1],
+            "song_chart_id": chart["id"], "steps": 0, "updated_at": created_at, "uuid": "",
+            "yellow": 0,
+        })
+    return {"songs": song_rows, "charts": chart_rows, "scores": score_rows}
+
+
+def generate_new_scores(
+    dataset: dict[str, list[dict]],
+    count: int,
+    *,
+    start: datetime = datetime(2026, 1, 30, 5, tzinfo=UTC),
+    end: datetime = datetime(2026, 2, 22, 5, tzinfo=UTC),
+    charts: list[dict] | None = None,
+    seed: int = 1,
+) -> list[dict]:
+    """
+    Scores played since `dataset` was generated, for incremental syncs to pick up
+
+    Each copies a random existing score of the event window, with a new id, a new score and
+        an updated_at of now, so it is past every high-water mark synced so far. With `charts`,
+        each is moved onto one of them, e.g. charts from generate_new_chart.
+    """
+    rng = random.Random(seed)
+    songs_by_id = {song["id"]: song for song in dataset["songs"]}
+    created_range = (_iso(start), _iso(end))
+    candidates = [
+        row for row in dataset["scores"]
+        if created_range[0] <= row["created_at"] <= created_range[1]
+    ] or dataset["scores"]
+    next_id = max((row["id"] for row in dataset["scores"]), default=0) + 1
+    updated_at = _iso(datetime.now(UTC))
+    new_rows = []
+    for score_id in range(next_id, next_id + count):
+        score = min(100_000, int(rng.betavariate(8, 1) * 100_000))
+        row = {
+            **rng.choice(candidates),
+            "_id": score_id, "id": score_id, "score": score, "cleared": score > 60_000,
+            "full_combo": score > 99_000, "updated_at": updated_at,
+        }
+        if charts:
+            chart = rng.choice(charts)
+            row.update(chart=chart, song=songs_by_id[chart["song_id"]], song_chart_id=chart["id"])
+        new_rows.append(row)
+    return new_rows
+
+
+def generate_new_chart(
+    dataset: dict[str, list[dict]],
+    *,
+    difficulty_name: str = "full",
+    seed: int = 2,
+) -> tuple[dict, dict]:
+    """
+    A song and its one chart released since `dataset` was generated, e.g. mid-event
+
+    Both are added to `dataset`, so a MockSMXApi serving it returns them from then on. Their
+        created_at and updated_at are now, so only incremental catalog syncs find them.
+    """
+    rng = random.Random(seed)
+    now = _iso(datetime.now(UTC))
+    song_id = max((song["id"] for song in dataset["songs"]), default=0) + 1
+    chart_id = max((chart["id"] for chart in dataset["charts"]), default=0) + 1
+    lowest, highest = next((low, high) for name, low, high in DIFFICULTIES if name == difficulty_name)
+    difficulty = rng.randint(lowest, highest)
+    song = {
+        **rng.choice(dataset["songs"]),
+        "_id": str(song_id), "created_at": now, "game_song_id": song_id, "id": song_id,
+        "release_date": now, "title": f"Song {song_id:04d}", "updated_at": now,
+    }
+    chart = {
+        **rng.choice(dataset["charts"]),
+        "_id": chart_id, "created_at": now, "difficulty": difficulty,
+        "difficulty_display": difficulty_name, "difficulty_name": difficulty_name, "id": chart_id,
+        "meter": difficulty, "song_id": song_id, "updated_at": now,
+    }
+    dataset["songs"].append(song)
+    dataset["charts"].append(chart)
+    return song, chart
+
+
+class MockSMXApi:
+    """
+    aiohttp application answering /songs, /charts and /scores from a dataset
+
+    :param latency: Seconds added to every response
+    :param jitter: Up to this many extra seconds added at random
+    """
+    def __init__(self, dataset: dict[str, list[dict]], *, latency: float = 0.0, jitter: float = 0.0):
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.rows_sent = 0
+        self.bytes_sent = 0
+        # scores by casefolded username, since nearly every score query names one gamer
+        self._scores_by_gamer: dict[str, list[dict]] = {}
+        for row in dataset["scores"]:
+            self._scores_by_gamer.setdefault(row["gamer"]["username"].casefold(), []).append(row)
+
+    def add_scores(self, rows: list[dict]):
+        """
+        Serve `rows` from now on, e.g. from generate_new_scores
+        """
+        self.dataset["scores"].extend(rows)
+        for row in rows:
+            self._scores_by_gamer.setdefault(row["gamer"]["username"].casefold(), []).append(row)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        for resource in ("songs", "charts", "scores"):
+            app.router.add_get(f"/{resource}", self._handler(resource))
+        return app
+
+    def query(self, resource: str, params: dict) -> list[dict]:
+        """
+        Rows of `resource` matching `params`, as the real API would return them
+        """
+        rows = self.dataset[resource]
+        username = params.get("gamer.username")
+        if resource == "scores" and isinstance(username, str):
+            rows = self._scores_by_gamer.get(username.casefold(), [])
+        filters = [
+            (key.split("."), value) for key, value in params.items()
+            if not key.startswith("_") and key != "gamer.username"
+        ]
+        rows = [row for row in rows if all(_matches(_field(row, path), value) for path, value in filters)]
+
+        group_by = params.get("_group_by")
+        if group_by:
+            best: dict = {}
+            for row in rows:
+                key = _field(row, group_by.split("."))
+                if key not in best or row["score"] > best[key]["score"]:
+                    best[key] = row
+            rows = list(best.values())
+        sort_field = params.get("_sort")
+        if sort_field:
+            key = (lambda row: to_timestamp(row[sort_field])) if sort_field.endswith("_at") else (lambda row: row[sort_field])
+            rows = sorted(rows, key=key, reverse=params.get("_order") == "desc")
+        skip = int(params.get("_skip", 0))
+        take = min(int(params.get("_take", MAX_TAKE)), MAX_TAKE)
+        return rows[skip:skip + take]
+
+    # private helpers
+    def _handler(self, resource: str):
+        async def handle(request: web.Request) -> web.Response:
+            self.requests += 1
+            if self.latency or self.jitter:
+                await asyncio.sleep(self.latency + random.random() * self.jitter)
+            params = json.loads(request.query.get("params", "{}"))
+            rows = self.query(resource, params)
+            body = json.dumps(rows)
+            self.rows_sent += len(rows)
+            self.bytes_sent += len(body)
+            return web.Response(text=body, content_type="application/json")
+        return handle
+
+
+class MockSMXServer:
+    """
+    Runs a MockSMXApi on localhost in a background thread, as a context manager
+
+    The fetcher under test runs its own event loop, so the server gets a separate one
+    """
+    def __init__(self, api: MockSMXApi, host: str = "127.0.0.1", port: int = 0):
+        self.api = api
+        self.host = host
+        self.port = port
+        self._loop = asyncio.new_event_loop()
+        self._runner: web.AppRunner | None = None
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "MockSMXServer":
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _start(self):
+        self._runner = web.AppRunner(self.api.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]  # resolved when port is 0
+
+
+def _field(row: dict, path: list[str]):
+    for key in path:
+        row = row[key]
+    return row
+
+
+def _matches(actual, expected) -> bool:
+    if isinstance(expected, dict):
+        for operator, bound in expected.items():
+            if isinstance(bound, str):  # datetimes
+                left, right = to_timestamp(actual), to_timestamp(bound)
+            else:
+                left, right = actual, bound
+            if operator == "gt" and not left > right:
+                return False
+            if operator == "gte" and not left >= right:
+                return False
+            if operator == "lt" and not left < right:
+                return False
+            if operator == "lte" and not left <= right:
+                return False
+        return True
+    if isinstance(expected, list):
+        return actual in expected
+    return actual == expected
@@ -1,48 +1,33 @@
-import json
+from pathlib import Path
 
 from gcs.gspread_auth import gspread_auth
-from src.Tournament import GauntletTournament
+from src.ReportWriter import ReportWriter
+from src.Tournament import GroupTournament
+from src.helpers import load_config_file
 
 debug = False
 
-# utilities
-def load_from_json(path):
-    with open(path) as file:
-        return json.load(file)
+# Event configuration details
+EVENT_FOLDER = Path(__file__).parent / "girlpoc-25-group"
+SPREADSHEET_CONFIG = "group_results_spreadsheet_key.json"
+MATCHES = [  # (match config, entrant list)
+    ("match_1.json", "entrants_1.json"),
+    ("match_2.json", "entrants_2.json"),
+]
 
 
 if __name__ == "__main__":
-    # cross-event constants
-    event_folder = './girlpoc-25-group/'
     gs = gspread_auth()
-    rs = gs.open_by_key(load_from_json(event_folder + 'group_results_spreadsheet_key.json').get('key'))
-    
-    m1_json = load_from_json(event_folder + 'match_1.json')
-    m1_config = m1_json['config']
-    m1_charts = m1_json['charts']
-    m1_entrants = load_from_json(event_folder + 'entrants_1.json')
-    m1 = GauntletTournament(
-        name="Match 1",
-        start_date=m1_config['start_date'],
-        end_date=m1_config['end_date'],
-        attempts_to_count=m1_config['attempts_to_count'],
-    )
-    m1.filter_songs_and_charts(m1_charts)
-    m1.load_entrants(m1_entrants)
-    m1.get_all_scores()
-    m1.report_results(rs.worksheet("Match 1"))
+    rs = gs.open_by_key(load_config_file(EVENT_FOLDER / SPREADSHEET_CONFIG)["key"])
+    report_writer = ReportWriter()
 
-    m2_json = load_from_json(event_folder + 'match_2.json')
-    m2_config = m2_json['config']
-    m2_charts = m2_json['charts']
-    m2_entrants = load_from_json(event_folder + 'entrants_2.json')
-    m2 = GauntletTournament(
-        name="Match 2",
-        start_date=m2_config['start_date'],
-        end_date=m2_config['end_date'],
-        attempts_to_count=m2_config['attempts_to_count'],
-    )
-    m2.filter_songs_and_charts(m2_charts)
-    m2.load_entrants(m2_entrants)
-    m2.get_all_scores()
-    m2.report_results(rs.worksheet("Match 2"))
\ No newline at end of file
+    for match_config, entrant_config in MATCHES:
+        match = GroupTournament.from_config_file(
+            config_filepath=EVENT_FOLDER / match_config,
+            entrant_filepath=EVENT_FOLDER / entrant_config,
+        )
+        match.get_all_scores()
+        for result in match.team_results():
+            print(result.team, result.total, list(zip(result.players, result.scores)))
+        match.stage_results(report_writer)
+    report_writer.flush(rs)
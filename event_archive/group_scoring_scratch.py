@@ -1,23 +1,10 @@
-from itertools import product
+from src.assignment import assign_charts
 
-TWO_PLAYER_OPTIONS = set([choice for choice in list(product([0,0,0,1,1,1], repeat=6)) if choice.count(1) == 3 and choice.count(0) == 3])
-THREE_PLAYER_OPTIONS = set([choice for choice in list(product([0,0,1,1,2,2], repeat=6)) if choice.count(2) == 2 and choice.count(1) == 2 and choice.count(0) == 2])
 
 def compute_max_combo(scores, two_entrant: bool = False):
-    options = THREE_PLAYER_OPTIONS
-    if two_entrant:
-        options = TWO_PLAYER_OPTIONS
-    max_score = 0
-    best_option = []
-    for option in options:
-        index = 0
-        total = 0
-        for val in option:
-            total += scores[val][index]
-        if total > max_score:
-            max_score = total
-            best_option = option
-    return max_score, best_option
+    # each player plays an equal share of the 6 charts
+    num_players = 2 if two_entrant else 3
+    return assign_charts(scores[:num_players], [6 // num_players] * num_players)
 
 print("\tMatch 1")
 t1 = ["MarryCherry", "freyja", "Pyrona"]
@@ -57,4 +44,4 @@ t4_scores = [
     [97516, 99747, 99072, 99105, 99759, 98980]
 ]
 print(t4)
-print(compute_max_combo(t4_scores))
\ No newline at end of file
+print(compute_max_combo(t4_scores))
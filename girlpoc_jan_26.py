@@ -1,12 +1,8 @@
+import argparse
 from pathlib import Path
 
-from gcs.gspread_auth import gspread_auth
-from src.Tournament import (
-    GauntletTournament,
-    LadderTournament,
-    make_eligibility_spreadsheet_for_gauntlet_tournaments,
-)
-from src.helpers import load_config_file
+from src.Event import Event
+from src.Metrics import get_metrics
 
 
 DEBUG = False
@@ -26,27 +22,42 @@ LADDER_CONFIGS = ["full.yaml"]
 
 
 if __name__ == "__main__":
-    gs = gspread_auth()
-    spreadsheet_key: str = load_config_file(EVENT_FOLDER / SPREADSHEET_CONFIG)["key"]
-    result_spreadsheet = gs.open_by_key(spreadsheet_key)
+    parser = argparse.ArgumentParser(description="Publish girlpoc jan 26 results")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running, publishing results whenever new scores come in",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=60.0,
+        help="seconds between checks for new scores, with --watch",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="run each phase under cProfile, writing its stats to DIR/<phase>.prof",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="record the peak memory of each phase with tracemalloc",
+    )
+    args = parser.parse_args()
 
-    gts = [
-        GauntletTournament.from_config_file(
-            config_filepath=EVENT_FOLDER / event_config_filename,
-            entrant_filepath=EVENT_FOLDER / ENTRANTS_CONFIG_FILENAME,
-        )
-        for event_config_filename in GAUNTLET_CONFIGS
-    ]
-    if gts:
-        make_eligibility_spreadsheet_for_gauntlet_tournaments(
-            result_spreadsheet=result_spreadsheet,
-            tournaments=gts,
-        )
-    lts = [
-        LadderTournament.from_config_file(
-            config_filepath=EVENT_FOLDER / event_config_filename,
-            entrant_filepath=EVENT_FOLDER / ENTRANTS_CONFIG_FILENAME,
-        )for event_config_filename in LADDER_CONFIGS
-    ]
-    for tournament in gts + lts:
-        tournament.run(result_spreadsheet)
+    metrics = get_metrics()
+    metrics.profile_dir = args.profile
+    metrics.trace_memory = args.trace_memory
+    event = Event(
+        EVENT_FOLDER,
+        entrants_config=ENTRANTS_CONFIG_FILENAME,
+        gauntlet_configs=GAUNTLET_CONFIGS,
+        ladder_configs=LADDER_CONFIGS,
+        spreadsheet_config=SPREADSHEET_CONFIG,
+    )
+    if args.watch:
+        event.watch(interval=args.interval)
+    else:
+        event.run_once(force=True)
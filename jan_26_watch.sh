@@ -0,0 +1,23 @@
+#!/bin/bash
+# jan_26_watch.sh
+# Resident alternative to jan_26_cronjob.sh: one process that publishes results as scores come in
+
+# Exit immediately if a command exits with a non-zero status
+set -e
+
+# Change to the directory containing the script
+cd "$(dirname "$0")"
+
+command_to_run="pipenv run python3 -u girlpoc_jan_26.py --watch --interval 60"
+
+# Timing
+start_time_epoch=$(date +%s)
+start_time_print=$(date -d @$start_time_epoch)
+start_time_filepath=$(date -d @$start_time_epoch +"%Y-%m-%d_%H-%M-%S")
+
+# Logfile
+log_filepath=./logs/$start_time_filepath.log
+
+# Run the python script using pipenv run
+echo "Starting watch at $start_time_print" |& tee $log_filepath
+$command_to_run |& tee -a $log_filepath
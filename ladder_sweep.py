@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from src.Tournament import LadderTournament
+
+
+# Event configuration details
+EVENT_FOLDER = Path(__file__).parent / "girlpoc-jan-26"
+ENTRANTS_CONFIG_FILENAME = "entrants.yaml"
+LADDER_CONFIG = "full.yaml"
+
+# ladder formula settings to compare, settings left out keep their configured value
+PARAMETER_GRID = {
+    "scoring_floor": [0, 50000, 80000],
+    "ladder_point_exponent": [2.0, 2.5, 3.0],
+    "num_scores_to_count": [10, 15, 20],
+}
+OUTPUT_FILENAME = "ladder_sweep.tsv"
+
+
+if __name__ == "__main__":
+    tournament = LadderTournament.from_config_file(
+        config_filepath=EVENT_FOLDER / LADDER_CONFIG,
+        entrant_filepath=EVENT_FOLDER / ENTRANTS_CONFIG_FILENAME,
+    )
+    tournament.get_all_scores()
+    sweep = tournament.sweep_formula(PARAMETER_GRID)
+
+    # one rank table, entrants by rank under the configured formula, one column per combination
+    swept = list(PARAMETER_GRID)
+    rank_table = sweep.pivot(index="entrant", columns=swept, values="rank")
+    configured = tuple(getattr(tournament, name) for name in swept)
+    if len(swept) == 1:
+        configured = configured[0]
+    if configured in rank_table.columns:
+        rank_table = rank_table.sort_values(configured)
+    print(rank_table.to_string())
+    rank_table.to_csv(EVENT_FOLDER / OUTPUT_FILENAME, sep="\t")
@@ -0,0 +1,107 @@
+import asyncio
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+
+from src.Score import Score
+from src.ScoreFetcher import ScoreFetcher
+from src.ScoreStore import to_timestamp
+
+
+@dataclass(slots=True)
+class AttemptPlan:
+    kind: str  # "stored", "broad" or "per_chart"
+    chart_ids: list[int] = field(default_factory=list)  # charts to query, for "per_chart"
+
+
+class AttemptPlanner:
+    """
+    Chooses how to fetch an entrant's first attempts on a set of charts
+
+    Only the first `attempts` scores per chart in the window count, and those never change
+        once they exist, so charts that already have them in the score store need no request.
+        For the rest, the planner compares one broad query of the entrant's window (synced
+        incrementally) against one query per chart, capped at `attempts` rows oldest first,
+        using the entrant's play rate from earlier runs to estimate the broad query's size.
+    """
+    def __init__(self, score_fetcher: ScoreFetcher, *, request_cost: float = 100.0):
+        self.score_fetcher = score_fetcher
+        self.request_cost = request_cost  # cost of a round trip, in rows transferred
+
+    def plan(
+        self,
+        entrant_name: str,
+        chart_ids: list[int],
+        attempts: int,
+        start: datetime,
+        end: datetime,
+    ) -> AttemptPlan:
+        """
+        Cheapest way to get an entrant's first `attempts` scores per chart within [start, end]
+        """
+        score_store = self.score_fetcher.score_store
+        counts = score_store.count_scores_per_chart(gamer=entrant_name, chart_ids=chart_ids, start=start, end=end)
+        missing = [chart_id for chart_id in chart_ids if counts[chart_id] < attempts]
+        if not missing:
+            return AttemptPlan("stored")
+
+        state = score_store.get_sync_state(entrant_name)
+        if state is not None and state.covers(to_timestamp(start), to_timestamp(end)):
+            return AttemptPlan("broad")  # window already synced, only new rows are requested
+        play_rate = score_store.play_rate(entrant_name)
+        if play_rate is None:
+            return AttemptPlan("broad")  # no history to estimate from
+
+        window_end = min(to_timestamp(end), datetime.now(UTC).timestamp())
+        expected_rows = play_rate * max(window_end - to_timestamp(start), 0) / 86400
+        broad_cost = max(math.ceil(expected_rows / self.score_fetcher.page_size), 1) * self.request_cost + expected_rows
+        per_chart_cost = len(missing) * (self.request_cost + attempts)
+        if per_chart_cost < broad_cost:
+            return AttemptPlan("per_chart", missing)
+        return AttemptPlan("broad")
+
+    async def load_first_attempts(
+        self,
+        *,
+        entrant_name: str,
+        chart_ids: list[int],
+        attempts: int,
+        start: datetime,
+        end: datetime,
+    ) -> list[Score]:
+        """
+        Scores of an entrant on `chart_ids` within [start, end], oldest first, fetched as planned
+
+        Covers at least the first `attempts` scores per chart
+        """
+        plan = self.plan(entrant_name, chart_ids, attempts, start, end)
+        if plan.kind == "broad":
+            return await self.score_fetcher.load_stored_entrant_scores(
+                entrant_name=entrant_name,
+                chart_ids=chart_ids,
+                start=start,
+                end=end,
+                sort_field="created_at",
+                order="asc",
+            )
+        # rows land in the score store, which answers the combined query below
+        await asyncio.gather(*[
+            self.score_fetcher.load_entrant_scores(
+                entrant_name=entrant_name,
+                chart_ids=[chart_id],
+                start=start,
+                end=end,
+                sort_field="created_at",
+                order="asc",
+                take=attempts,
+            )
+            for chart_id in plan.chart_ids
+        ])
+        return self.score_fetcher.query_stored_scores(
+            entrant_name=entrant_name,
+            chart_ids=chart_ids,
+            start=start,
+            end=end,
+            sort_field="created_at",
+            order="asc",
+        )
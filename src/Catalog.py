@@ -0,0 +1,121 @@
+from src.Chart import Chart
+from src.Song import Song
+
+
+class Catalog:
+    """
+    Indexed SMX song and chart lists
+
+    Built once by ScoreFetcher so lookups by id, title and difficulty are dict hits
+        instead of scans over every song and chart
+    """
+    def __init__(self, songs: list[Song], charts: list[Chart]):
+        self.songs = songs
+        self.charts = charts
+
+        self._songs_by_id: dict[int, Song] = {}
+        self._songs_by_title: dict[str, list[Song]] = {}
+        for song in songs:
+            self._index_song(song)
+
+        self._charts_by_id: dict[int, Chart] = {}
+        self._charts_by_difficulty: dict[tuple[int, int, str], list[Chart]] = {}
+        for chart in charts:
+            self._index_chart(chart)
+
+    # lookups by id
+    def get_song(self, song_id: int) -> Song | None:
+        return self._songs_by_id.get(song_id)
+
+    def get_chart(self, chart_id: int) -> Chart | None:
+        return self._charts_by_id.get(chart_id)
+
+    def add_song(self, song: Song):
+        """
+        Add a song that is newer than the catalog, e.g. one first seen on a score
+        """
+        self.songs.append(song)
+        self._index_song(song)
+
+    def add_chart(self, chart: Chart):
+        """
+        Add a chart that is newer than the catalog, e.g. one first seen on a score
+        """
+        self.charts.append(chart)
+        self._index_chart(chart)
+
+    # lookups by name
+    def find_song(self, title: str) -> Song:
+        """
+        Find the one song whose title or subtitle matches, ignoring case
+
+        :param title: Song title or subtitle
+        :type title: str
+        :raises ValueError: If no song, or more than one song, matches
+        """
+        songs = self._songs_by_title.get(str(title).casefold(), [])
+        if not songs:
+            raise ValueError(f"No song found with title or subtitle {title!r}")
+        if len(songs) > 1:
+            candidates = ", ".join(f"{song.title!r} by {song.artist} (id {song.id})" for song in songs)
+            raise ValueError(f"Song title {title!r} is ambiguous, matches: {candidates}")
+        return songs[0]
+
+    def find_charts(self, song_id: int, difficulty: int, difficulty_name: str) -> list[Chart]:
+        """
+        Charts of a song at a difficulty, whose difficulty name starts with `difficulty_name`
+
+        :param song_id: Song id
+        :type song_id: int
+        :param difficulty: Difficulty (block) rating
+        :type difficulty: int
+        :param difficulty_name: Prefix of the difficulty name, ignoring case (e.g. 'wild')
+        :type difficulty_name: str
+        """
+        return self._charts_by_difficulty.get(
+            (song_id, difficulty, str(difficulty_name).casefold()), []
+        )
+
+    def resolve_charts(self, chart_filters: list[dict]) -> tuple[list[Song], list[Chart]]:
+        """
+        Resolve tournament chart configs (title, difficulty, difficulty_name) to songs and charts
+
+        :param chart_filters: Chart configs, in tournament order
+        :type chart_filters: list[dict]
+        :return: One song and one chart per config, in the same order
+        :rtype: tuple[list[Song], list[Chart]]
+        :raises ValueError: If a config matches no chart, or more than one without an exact name match
+        """
+        songs = []
+        charts = []
+        for filter_ in chart_filters:
+            song = self.find_song(filter_["title"])
+            matches = self.find_charts(song.id, filter_["difficulty"], filter_["difficulty_name"])
+            if len(matches) > 1:  # prefer an exact difficulty name over a longer one, e.g. wild over wild2
+                matches = [
+                    chart for chart in matches
+                    if chart.difficulty_name.casefold() == str(filter_["difficulty_name"]).casefold()
+                ]
+            if len(matches) != 1:
+                raise ValueError(
+                    f"Expected one chart for {song.title!r} {filter_['difficulty_name']} "
+                    f"{filter_['difficulty']}, found {len(matches)}"
+                )
+            songs.append(song)
+            charts.append(matches[0])
+        return songs, charts
+
+    # private helpers
+    def _index_song(self, song: Song):
+        self._songs_by_id[song.id] = song
+        titles = {song.title.casefold(), song.subtitle.casefold()} - {""}
+        for title in titles:
+            self._songs_by_title.setdefault(title, []).append(song)
+
+    def _index_chart(self, chart: Chart):
+        self._charts_by_id[chart.id] = chart
+        # index every prefix of the difficulty name, so prefix matching is a single lookup
+        difficulty_name = chart.difficulty_name.casefold()
+        for length in range(len(difficulty_name) + 1):
+            key = (chart.song_id, chart.difficulty, difficulty_name[:length])
+            self._charts_by_difficulty.setdefault(key, []).append(chart)
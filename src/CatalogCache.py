@@ -0,0 +1,113 @@
+import json
+import os
+from datetime import datetime, UTC
+from pathlib import Path
+
+
+class CatalogCache:
+    """
+    Local copy of one SMX.573.no catalog (songs or charts), as an append-only JSON lines log
+
+    Each sync appends one line holding only the entries updated since the previous sync,
+        so nothing already on disk is rewritten. Loading replays the log into a dict by id.
+        Once the log holds many more lines or entries than the live catalog, it is compacted
+        back into a single line.
+    """
+    def __init__(self, path: Path, *, compact_after: int = 50, compact_ratio: float = 2.0):
+        self.path = path  # e.g. data/songs, the log is data/songs_log.jsonl
+        self.compact_after = compact_after  # max sync lines before compacting
+        self.compact_ratio = compact_ratio  # max logged entries per live entry before compacting
+        self.entries: dict[int, dict] = {}
+        self.synced_at: str | None = None  # datetime in UTC of the last sync, None if never synced
+        self._lines = 0
+        self._logged_entries = 0
+
+    @property
+    def log_path(self) -> Path:
+        return Path(str(self.path) + '_log.jsonl')
+
+    def load(self) -> dict[int, dict]:
+        """
+        Replay the log from disk, migrating the old full-rewrite cache files if there is no log yet
+        """
+        self.entries = {}
+        self.synced_at = None
+        self._lines = 0
+        self._logged_entries = 0
+        if not self.log_path.exists():
+            self._migrate()
+            return self.entries
+        with open(self.log_path, "r") as log_file:
+            for line in log_file:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # partially written last line from an interrupted sync
+                self._apply(record)
+        return self.entries
+
+    def append(self, entries: list[dict], synced_at: str):
+        """
+        Apply entries updated since the previous sync, and log them
+
+        A sync that found nothing only moves `synced_at` forward in memory, so frequent
+            syncs (e.g. a resident watch) don't fill the log with empty lines.
+            Starting again from the last logged sync time is harmless.
+
+        :param entries: Raw API entries, replacing any existing entry with the same id
+        :type entries: list[dict]
+        :param synced_at: Time the updates were requested, in UTC
+        :type synced_at: str
+        """
+        if not entries:
+            self.synced_at = synced_at
+            return
+        record = {"synced_at": synced_at, "entries": entries}
+        self._apply(record)
+        if self._lines > self.compact_after or self._logged_entries > self.compact_ratio * max(len(self.entries), 1):
+            self.compact()
+            return
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a") as log_file:
+            log_file.write(json.dumps(record) + "\n")
+
+    def compact(self):
+        """
+        Rewrite the log as a single line holding every live entry
+        """
+        record = {"synced_at": self.synced_at, "entries": list(self.entries.values())}
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.log_path.with_suffix(".tmp")
+        with open(temp_path, "w") as log_file:
+            log_file.write(json.dumps(record) + "\n")
+        os.replace(temp_path, self.log_path)  # never leave a half written log behind
+        self._lines = 1
+        self._logged_entries = len(self.entries)
+
+    # private helpers
+    def _apply(self, record: dict):
+        for entry in record["entries"]:
+            self.entries[entry["id"]] = entry
+        self.synced_at = record["synced_at"]
+        self._lines += 1
+        self._logged_entries += len(record["entries"])
+
+    def _migrate(self):
+        """
+        Seed the log from the `<name>_data.json` and `<name>_updated_at.txt` files used before
+        """
+        data_filepath = Path(str(self.path) + '_data.json')
+        upd_at_filepath = Path(str(self.path) + '_updated_at.txt')
+        try:
+            with open(data_filepath, "r") as data_file:
+                data: list = json.load(data_file)
+            with open(upd_at_filepath, "r") as upd_file:
+                prev_upd_at = datetime.strptime(upd_file.read(), "%a, %b %d %Y %H:%M:%S")
+        except FileNotFoundError:
+            return
+        self._apply({"synced_at": str(prev_upd_at.replace(tzinfo=UTC)), "entries": data})
+        self.compact()
+        data_filepath.unlink()
+        upd_at_filepath.unlink()
@@ -1,12 +1,12 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class EligibilityConfig:
     difficulty: int
     score: int
     count: int = 1
 
-@dataclass
+@dataclass(slots=True)
 class Eligibility:
     eligible: bool
     difficulty: int | None = None
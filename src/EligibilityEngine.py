@@ -0,0 +1,138 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from src.Eligibility import Eligibility, EligibilityConfig
+from src.Entrant import Entrant
+from src.Score import Score
+from src.ScoreFetcher import ScoreFetcher, get_score_fetcher
+from src.ScoreStore import to_timestamp
+
+
+@dataclass(slots=True)
+class _EligibilityCheck:
+    entrants: list[Entrant]
+    before: datetime
+    requirements: list[EligibilityConfig]
+    resolved: bool = False
+
+
+@dataclass(slots=True)
+class _PreEventHistory:
+    difficulty: int  # lowest difficulty fetched
+    score: int  # lowest score fetched
+    scores: list[Score] = field(default_factory=list)
+
+
+class EligibilityEngine:
+    """
+    Evaluates `disqualify_if` rules for every registered Tournament from one fetch per entrant
+
+    For each entrant and cutoff date, the best score per chart before the cutoff is fetched
+        once, at the lowest difficulty and score any registered rule needs. Every rule is then
+        evaluated locally against that history.
+    """
+    max_difficulty = 26  # rules count charts below this difficulty
+
+    def __init__(self, score_fetcher: ScoreFetcher | None = None):
+        self._score_fetcher = score_fetcher
+        self._checks: list[_EligibilityCheck] = []
+        # (entrant name casefolded, cutoff timestamp) -> best pre-cutoff scores
+        self._histories: dict[tuple[str, float], _PreEventHistory] = {}
+
+    @property
+    def score_fetcher(self) -> ScoreFetcher:
+        if self._score_fetcher is None:
+            self._score_fetcher = get_score_fetcher()
+        return self._score_fetcher
+
+    def register(
+        self,
+        entrants: list[Entrant],
+        before: datetime,
+        requirements: list[EligibilityConfig],
+    ):
+        """
+        Queue entrants to have their eligibilities set from `requirements` on the next resolve
+
+        :param entrants: Entrants to check
+        :type entrants: list[Entrant]
+        :param before: Only scores created before this count against the requirements
+        :type before: datetime
+        :param requirements: Requirements that each disqualify an entrant when met
+        :type requirements: list[EligibilityConfig]
+        """
+        self._checks.append(_EligibilityCheck(entrants, before, requirements))
+
+    def resolve(self):
+        """
+        Fetch any missing pre-event history, then set eligibilities for every pending check
+        """
+        pending = [check for check in self._checks if not check.resolved]
+        if not pending:
+            return
+        self._fetch_histories(pending)
+        for check in pending:
+            for entrant in check.entrants:
+                entrant.eligiblities = [
+                    self.evaluate(entrant.name, check.before, requirement)
+                    for requirement in check.requirements
+                ]
+            check.resolved = True
+
+    def evaluate(self, entrant_name: str, before: datetime, requirement: EligibilityConfig) -> Eligibility:
+        """
+        Evaluate one requirement against already fetched history
+
+        :raises KeyError: If the entrant's history before `before` has not been fetched
+        """
+        history = self._histories[(entrant_name.casefold(), to_timestamp(before))]
+        matching_charts = [
+            score for score in history.scores
+            if requirement.difficulty <= score.chart.difficulty < self.max_difficulty
+            and score.score >= requirement.score
+        ]
+        return Eligibility(
+            eligible=not len(matching_charts) >= requirement.count,
+            difficulty=requirement.difficulty,
+            score=str(requirement.score) + "+",
+            count=requirement.count,
+        )
+
+    # private helpers
+    def _fetch_histories(self, checks: list[_EligibilityCheck]):
+        # lowest difficulty and score needed per (entrant, cutoff), across every check
+        needed: dict[tuple[str, float], tuple[str, datetime, int, int]] = {}
+        for check in checks:
+            check_difficulty = min(requirement.difficulty for requirement in check.requirements)
+            check_score = min(requirement.score for requirement in check.requirements)
+            for entrant in check.entrants:
+                key = (entrant.name.casefold(), to_timestamp(check.before))
+                difficulty, score = check_difficulty, check_score
+                if key in needed:
+                    _, _, needed_difficulty, needed_score = needed[key]
+                    difficulty = min(difficulty, needed_difficulty)
+                    score = min(score, needed_score)
+                needed[key] = (entrant.name, check.before, difficulty, score)
+
+        # skip histories already fetched deep enough
+        to_fetch = []
+        for key, (name, before, difficulty, score) in needed.items():
+            history = self._histories.get(key)
+            if history is None or history.difficulty > difficulty or history.score > score:
+                to_fetch.append((key, difficulty, score, name, before))
+        if not to_fetch:
+            return
+
+        searches = [
+            self.score_fetcher.load_entrant_scores(
+                entrant_name=name,
+                difficulty=list(range(difficulty, self.max_difficulty)),
+                score_gte=score,
+                end=before,  # only disqualify based on scores beforehand
+                get_max_only=True,
+            )
+            for _, difficulty, score, name, before in to_fetch
+        ]
+        results = self.score_fetcher.execute_coroutines(searches)
+        for (key, difficulty, score, _, _), result in zip(to_fetch, results):
+            self._histories[key] = _PreEventHistory(difficulty=difficulty, score=score, scores=result)
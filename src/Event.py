@@ -0,0 +1,241 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.Metrics import Metrics, get_metrics
+from src.ReportWriter import ReportWriter
+from src.ScoreFetcher import ScoreFetcher, get_score_fetcher
+from src.ScorePool import ScorePool
+from src.Tournament import (
+    GauntletTournament,
+    LadderTournament,
+    Tournament,
+    make_eligibility_spreadsheet_for_gauntlet_tournaments,
+)
+from src.helpers import load_config_file
+
+# gspread is only imported once results are actually published
+if TYPE_CHECKING:
+    from gspread.spreadsheet import Spreadsheet
+
+
+class Event:
+    """
+    Every Tournament of one event, kept in memory between result updates
+
+    The song/chart catalog, the HTTP session, the Sheets client, and the tournaments built
+        from the event's config files all live as long as the Event. Each update syncs new
+        songs, charts and scores, and only recomputes and publishes results when a score was
+        added or updated. Tournaments are rebuilt when a config file changes.
+
+    Updates are pipelined: score requests run on the fetcher's event loop (up to its
+        `max_concurrency` at once) while Sheets calls run on one background thread, so the
+        spreadsheet is opened while scores are fetched. Results, the eligibility sheet and its
+        formatting are then sent in a single batch, since every Sheets call is slower than
+        computing all the standings.
+    """
+    def __init__(
+        self,
+        folder: Path,
+        *,
+        entrants_config: str = "entrants.yaml",
+        gauntlet_configs: list[str] | None = None,
+        ladder_configs: list[str] | None = None,
+        spreadsheet_config: str = "result_spreadsheet_key.yaml",
+        score_fetcher: ScoreFetcher | None = None,
+        metrics: Metrics | None = None,
+        metrics_path: Path | None = None,
+    ):
+        self.folder = folder
+        self.entrants_config = entrants_config
+        self.gauntlet_configs = gauntlet_configs if gauntlet_configs else []
+        self.ladder_configs = ladder_configs if ladder_configs else []
+        self.spreadsheet_config = spreadsheet_config
+        self._score_fetcher = score_fetcher
+        self._score_sync_interval: float | None = None  # seconds, set by watch
+        self._spreadsheet: "Spreadsheet | None" = None
+
+        # phase timings and request counts of each update, appended as one JSON line per run
+        if metrics is None:
+            metrics = score_fetcher.metrics if score_fetcher is not None else get_metrics()
+        self.metrics = metrics
+        if metrics_path is None:
+            metrics_path = Path(__file__).parent.parent / "data" / "run_metrics.jsonl"
+        self.metrics_path = metrics_path
+
+        # results for every worksheet are staged, then sent together, only where they changed
+        self.report_writer = ReportWriter(metrics=self.metrics)
+        self.score_pool: ScorePool | None = None
+        self.gauntlet_tournaments: list[GauntletTournament] = []
+        self.ladder_tournaments: list[LadderTournament] = []
+        self._config_mtimes: dict[Path, float] = {}
+        self._published_signature: int | None = None
+        self._eligibility_published = False
+
+    @property
+    def score_fetcher(self) -> ScoreFetcher:
+        if self._score_fetcher is None:
+            self._score_fetcher = get_score_fetcher()
+            if self._score_sync_interval is not None:
+                self._score_fetcher.score_sync_interval = self._score_sync_interval
+        return self._score_fetcher
+
+    @property
+    def tournaments(self) -> list[Tournament]:
+        return self.gauntlet_tournaments + self.ladder_tournaments
+
+    @property
+    def spreadsheet(self) -> "Spreadsheet":
+        """
+        Result spreadsheet, authenticated and opened once
+        """
+        if self._spreadsheet is None:
+            from gcs.gspread_auth import gspread_auth
+
+            spreadsheet_key: str = load_config_file(self.folder / self.spreadsheet_config)["key"]
+            self._spreadsheet = gspread_auth().open_by_key(spreadsheet_key)
+        return self._spreadsheet
+
+    def build(self):
+        """
+        (Re)build every Tournament from the event's config files
+        """
+        with self.metrics.span("catalog"):
+            score_fetcher = self.score_fetcher  # syncs the song/chart catalog when first built
+        with self.metrics.span("build"):
+            self._build_tournaments(score_fetcher)
+        self._config_mtimes = self._read_config_mtimes()
+        self._published_signature = None
+        self._eligibility_published = False
+
+    def run_once(self, force: bool = False) -> bool:
+        """
+        Sync new scores, then recompute and publish results if anything changed
+
+        The run's phase timings and counters are appended to `metrics_path`
+
+        :param force: Publish even if no score changed since the last update
+        :type force: bool
+        :return: Whether results were published
+        :rtype: bool
+        """
+        self.metrics.reset()
+        try:
+            return self._update(force)
+        finally:
+            self.metrics.write(self.metrics_path)
+            counters = self.metrics.counters
+            print(
+                f"Run took {self.metrics.summary()['seconds']:.1f}s: "
+                f"{counters.get('http_requests', 0)} requests, {counters.get('rows', 0)} rows, "
+                f"{counters.get('sheets_calls', 0)} Sheets calls"
+            )
+
+    def watch(self, interval: float = 60.0):
+        """
+        Keep results up to date, checking for new scores every `interval` seconds until interrupted
+
+        A failed update is reported and retried on the next check. Entrant syncs stay fresh for
+            half the interval, so every check asks the API for new scores, but one check never
+            syncs the same query twice.
+
+        :param interval: Seconds between checks
+        :type interval: float
+        """
+        self._score_sync_interval = interval / 2
+        if self._score_fetcher is not None:
+            self._score_fetcher.score_sync_interval = self._score_sync_interval
+        while True:
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception as error:
+                print(f"Update failed, retrying in {interval:.0f}s: {type(error).__name__}: {error}")
+            time.sleep(max(interval - (time.monotonic() - started), 0))
+
+    # private helpers
+    def _build_tournaments(self, score_fetcher: ScoreFetcher):
+        # every tournament covers the same entrants and window, so fetch their scores once
+        self.score_pool = ScorePool(score_fetcher)
+        self.gauntlet_tournaments = [
+            GauntletTournament.from_config_file(
+                config_filepath=self.folder / config_filename,
+                entrant_filepath=self.folder / self.entrants_config,
+                score_fetcher=score_fetcher,
+                score_pool=self.score_pool,
+            )
+            for config_filename in self.gauntlet_configs
+        ]
+        self.ladder_tournaments = [
+            LadderTournament.from_config_file(
+                config_filepath=self.folder / config_filename,
+                entrant_filepath=self.folder / self.entrants_config,
+                score_fetcher=score_fetcher,
+                score_pool=self.score_pool,
+            )
+            for config_filename in self.ladder_configs
+        ]
+
+    def _update(self, force: bool) -> bool:
+        if self.score_pool is None or self._read_config_mtimes() != self._config_mtimes:
+            self.build()
+        else:
+            with self.metrics.span("catalog"):
+                self.score_fetcher.refresh_catalog()  # charts released since the last check
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets") as sheets:
+            # Sheets calls that don't need this run's scores overlap the score requests
+            jobs: list[Future] = []
+            if force or self._published_signature is None:  # results will be published
+                jobs.append(sheets.submit(lambda: self.spreadsheet))
+            with self.metrics.span("eligibility"):
+                for tournament in self.gauntlet_tournaments:
+                    tournament.resolve_eligibility()
+            # eligibility only depends on scores from before the event, so it is published once
+            if self.gauntlet_tournaments and not self._eligibility_published:
+                jobs.append(sheets.submit(self._report_eligibility))
+            with self.metrics.span("fetch"):
+                self.score_pool.fetch()
+            signature = self.score_pool.signature()
+            if not force and signature == self._published_signature:
+                _wait_for(jobs)
+                print("No new scores, nothing to publish")
+                return False
+
+            for tournament in self.tournaments:
+                with self.metrics.span(f"compute:{tournament.name}"):
+                    tournament.get_all_scores()
+                with self.metrics.span(f"report:{tournament.name}"):
+                    tournament.stage_results(self.report_writer)
+            _wait_for(jobs)
+        with self.metrics.span("publish"):
+            self.report_writer.flush(self.spreadsheet)  # every staged grid, in one values update
+        self._eligibility_published = True
+        self._published_signature = signature
+        return True
+
+    def _report_eligibility(self):
+        # the grid and its conditional formatting are staged, and sent with the rest
+        with self.metrics.span("report:eligibility"):
+            make_eligibility_spreadsheet_for_gauntlet_tournaments(
+                result_spreadsheet=self.spreadsheet,
+                tournaments=self.gauntlet_tournaments,
+                report_writer=self.report_writer,
+            )
+
+    def _read_config_mtimes(self) -> dict[Path, float]:
+        filepaths = [
+            self.folder / config_filename
+            for config_filename in [self.entrants_config, *self.gauntlet_configs, *self.ladder_configs]
+        ]
+        return {filepath: filepath.stat().st_mtime for filepath in filepaths}
+
+
+def _wait_for(jobs: list[Future]):
+    """
+    Wait for every job, then raise the first failure, if any
+    """
+    errors = [job.exception() for job in jobs]
+    for error in errors:
+        if error is not None:
+            raise error
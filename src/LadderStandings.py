@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+
+from sortedcontainers import SortedList
+
+from src.Score import Score
+
+
+@dataclass(slots=True)
+class _CountedScore:
+    points: float
+    score: Score
+    order: int  # arrival order, breaks ties like a stable sort
+
+
+class LadderStandings:
+    """
+    Ladder standings that are updated one score at a time
+
+    Each entrant keeps their best score per chart, and their scores ordered by ladder points
+        with the total of the top `num_scores_to_count` maintained as scores come and go.
+        Entrants are kept ordered by total, so the ranking is read without a re-sort.
+
+    Both orders are SortedLists, so a new score costs O(log n): a search, an insert and a delete
+        on the entrant's scores, a lookup of the score entering or leaving the top, and a delete
+        and an insert on the ranking.
+
+    Totals are kept in hundredths, summing points rounded to 2 decimals like the results sheet.
+    """
+    def __init__(self, entrant_names: list[str], num_scores_to_count: int):
+        self.num_scores_to_count = num_scores_to_count
+        self._entrant_order = {name: index for index, name in enumerate(entrant_names)}
+        self._best: dict[str, dict[int, _CountedScore]] = {name: {} for name in entrant_names}
+        # per entrant, (-points, order) of every best score, i.e. highest points first
+        self._ordered: dict[str, SortedList] = {name: SortedList() for name in entrant_names}
+        self._by_key: dict[str, dict[tuple[float, int], _CountedScore]] = {name: {} for name in entrant_names}
+        self._totals: dict[str, int] = {name: 0 for name in entrant_names}  # hundredths
+        # (-total, entrant order, name) of every entrant, i.e. rank order
+        self._ranking = SortedList((0, index, name) for index, name in enumerate(entrant_names))
+        self._arrivals = 0
+
+    def add(self, entrant_name: str, score: Score, points: float) -> bool:
+        """
+        Count a new score, if it beats the entrant's best on its chart
+
+        :param entrant_name: Entrant the score belongs to
+        :type entrant_name: str
+        :param score: Score already matching the ladder's filters
+        :type score: Score
+        :param points: Ladder points of the score
+        :type points: float
+        :return: Whether the entrant's best scores changed
+        :rtype: bool
+        """
+        best = self._best[entrant_name]
+        previous = best.get(score.song_chart_id)
+        if previous is not None and score.score <= previous.score.score:
+            if score.id != previous.score.id:
+                return False
+            # same score updated in place, recount it
+        old_total = self._totals[entrant_name]
+        if previous is not None:
+            self._remove(entrant_name, previous)
+        counted = _CountedScore(points, score, self._arrivals)
+        self._arrivals += 1
+        best[score.song_chart_id] = counted
+        self._insert(entrant_name, counted)
+        self._rerank(entrant_name, old_total)
+        return True
+
+    def total(self, entrant_name: str) -> float | int:
+        """
+        Ladder point total of an entrant, 0 without any scores
+        """
+        if not self._best[entrant_name]:
+            return 0
+        return self._totals[entrant_name] / 100
+
+    def rank(self, entrant_name: str) -> int:
+        """
+        1-based rank of an entrant, ties ordered like the entrant list
+        """
+        key = (-self._totals[entrant_name], self._entrant_order[entrant_name], entrant_name)
+        return self._ranking.bisect_left(key) + 1
+
+    def ranking(self) -> list[tuple[float | int, str]]:
+        """
+        (total, entrant name) for every entrant, best first
+        """
+        return [(self.total(name), name) for _, _, name in self._ranking]
+
+    def scores(self, entrant_name: str, count: int | None = None) -> list[tuple[Score, float]]:
+        """
+        (score, ladder points) of an entrant's best scores, highest points first
+
+        :param count: Number of scores to return, all of them if None
+        :type count: int | None
+        """
+        by_key = self._by_key[entrant_name]
+        ordered = self._ordered[entrant_name].islice(0, count)
+        return [(by_key[key].score, by_key[key].points) for key in ordered]
+
+    # private helpers
+    def _remove(self, entrant_name: str, counted: _CountedScore):
+        ordered = self._ordered[entrant_name]
+        key = (-counted.points, counted.order)
+        index = ordered.bisect_left(key)
+        if index < self.num_scores_to_count:
+            self._totals[entrant_name] -= _hundredths(counted.points)
+            if len(ordered) > self.num_scores_to_count:  # the next best score moves into the top
+                self._totals[entrant_name] += _hundredths(self._by_key[entrant_name][ordered[self.num_scores_to_count]].points)
+        ordered.remove(key)
+        del self._by_key[entrant_name][key]
+
+    def _insert(self, entrant_name: str, counted: _CountedScore):
+        ordered = self._ordered[entrant_name]
+        key = (-counted.points, counted.order)
+        index = ordered.bisect_left(key)
+        if index < self.num_scores_to_count:
+            self._totals[entrant_name] += _hundredths(counted.points)
+            if len(ordered) >= self.num_scores_to_count:  # the last counted score drops out of the top
+                self._totals[entrant_name] -= _hundredths(self._by_key[entrant_name][ordered[self.num_scores_to_count - 1]].points)
+        ordered.add(key)
+        self._by_key[entrant_name][key] = counted
+
+    def _rerank(self, entrant_name: str, old_total: int):
+        order = self._entrant_order[entrant_name]
+        self._ranking.remove((-old_total, order, entrant_name))
+        self._ranking.add((-self._totals[entrant_name], order, entrant_name))
+
+
+def _hundredths(points: float) -> int:
+    return round(round(points, 2) * 100)
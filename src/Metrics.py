@@ -0,0 +1,139 @@
+import cProfile
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from pathlib import Path
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    started: float  # seconds since the run began
+    seconds: float = 0.0
+    counters: dict[str, int] = field(default_factory=dict)  # counted while the span was open
+    memory_peak_kb: float | None = None  # with trace_memory
+
+
+class Metrics:
+    """
+    Timing spans and counters for one run, summarized as JSON
+
+    Spans time the phases of a run (catalog sync, eligibility, fetch, compute and report per
+        tournament). Counters tally work across the run, e.g. HTTP requests, pages, rows,
+        bytes, retries and Sheets calls, and each span records the counts made while it was open.
+
+    Deeper dives are opt-in: with `profile_dir`, each span is run under cProfile and its stats
+        dumped to `<profile_dir>/<span>.prof`; with `trace_memory`, each span records its
+        tracemalloc peak.
+    """
+    def __init__(self, *, profile_dir: Path | None = None, trace_memory: bool = False):
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        self._lock = threading.Lock()  # spans may run on report threads
+        self.reset()
+
+    def reset(self):
+        """
+        Start a new run, dropping every span and counter
+        """
+        self.run_started_at = datetime.now(UTC)
+        self.spans: list[Span] = []
+        self.counters: dict[str, int] = {}
+        self._started = time.perf_counter()
+        self._local = threading.local()  # per thread, whether a span is being profiled
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        Time the enclosed block as a phase of the run
+
+        Spans may nest, but only the outermost one on each thread is profiled
+
+        :param name: Phase name, e.g. "fetch" or "compute:Full Ladder"
+        :type name: str
+        """
+        span = Span(name, round(time.perf_counter() - self._started, 4))
+        with self._lock:
+            counters_before = dict(self.counters)
+        profiler = None
+        if self.profile_dir is not None and not getattr(self._local, "profiling", False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self._local.profiling = True
+            except ValueError:  # another thread's profiler is active, where only one is allowed
+                profiler = None
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.seconds = round(time.perf_counter() - started, 4)
+            if self.trace_memory:
+                span.memory_peak_kb = round((tracemalloc.get_traced_memory()[1] - memory_before) / 1024, 1)
+            if profiler is not None:
+                profiler.disable()
+                self._local.profiling = False
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(self.profile_dir / f"{_filename(name)}.prof")
+            with self._lock:
+                span.counters = {
+                    counter: value - counters_before.get(counter, 0)
+                    for counter, value in self.counters.items()
+                    if value != counters_before.get(counter, 0)
+                }
+                self.spans.append(span)
+
+    def summary(self) -> dict:
+        """
+        Spans and counters of the run so far, ready for json.dumps
+        """
+        spans = []
+        for span in self.spans:
+            entry = {"name": span.name, "started": span.started, "seconds": span.seconds, "counters": span.counters}
+            if span.memory_peak_kb is not None:
+                entry["memory_peak_kb"] = span.memory_peak_kb
+            spans.append(entry)
+        return {
+            "run_started_at": self.run_started_at.isoformat(),
+            "seconds": round(time.perf_counter() - self._started, 4),
+            "counters": dict(self.counters),
+            "spans": spans,
+        }
+
+    def write(self, path: Path):
+        """
+        Append the run's summary to a JSON lines file, one line per run
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as metrics_file:
+            metrics_file.write(json.dumps(self.summary()) + "\n")
+
+
+def _filename(span_name: str) -> str:
+    return "".join(char if char.isalnum() or char in "-_." else "_" for char in span_name)
+
+
+_default_metrics: Metrics | None = None
+
+
+def get_metrics() -> Metrics:
+    """
+    Shared Metrics of this process, created on first use
+    """
+    global _default_metrics
+    if _default_metrics is None:
+        _default_metrics = Metrics()
+    return _default_metrics
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Client-side throttle for SMX.573.no API requests
+
+    Combines a token bucket, capping the sustained request rate, with an adaptive limit on
+        requests in flight. The limit grows by one per round of fast responses (additive
+        increase) and halves whenever the server pushes back with a 429 or 5xx
+        (multiplicative decrease), so throughput settles at what the server tolerates.
+    """
+    def __init__(
+        self,
+        *,
+        rate: float = 20.0,
+        burst: int = 10,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        slow_latency: float = 2.0,
+    ):
+        self.rate = rate  # tokens (requests) per second
+        self.burst = burst  # bucket capacity
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.slow_latency = slow_latency  # seconds, slower responses do not ramp up concurrency
+        self.concurrency = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0  # monotonic time, set from Retry-After
+        self._last_decrease = 0.0  # monotonic time of the last backoff
+        self._active = 0
+        self._condition: asyncio.Condition | None = None  # created on the event loop at first use
+
+    async def acquire(self):
+        """
+        Wait for a free request slot and a token, then take both
+        """
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < int(self.concurrency))
+            self._active += 1
+        try:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+        except BaseException:
+            # cancelled while waiting for a token, so give the slot back
+            async with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+            raise
+
+    async def release(self, *, latency: float, throttled: bool = False, retry_after: float | None = None):
+        """
+        Free a request slot and adapt the concurrency limit to how the request went
+
+        :param latency: Seconds the request took
+        :type latency: float
+        :param throttled: Whether the server pushed back (429 or 5xx)
+        :type throttled: bool
+        :param retry_after: Seconds the server asked us to wait, if it did
+        :type retry_after: float | None
+        """
+        now = time.monotonic()
+        if throttled:
+            # requests in flight at the same time all fail together, only back off once for them
+            if now - self._last_decrease > self.slow_latency:
+                self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+                self._last_decrease = now
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, now + retry_after)
+        elif latency < self.slow_latency:
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    # private helpers
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
@@ -0,0 +1,340 @@
+import json
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.Metrics import Metrics, get_metrics
+
+# gspread and gspread_formatting are only imported when results are actually sent
+if TYPE_CHECKING:
+    from gspread.spreadsheet import Spreadsheet
+
+# a cell value of None leaves the existing cell untouched
+Grid = list[list[str | None]]
+
+
+@dataclass(slots=True)
+class ConditionalFormat:
+    a1_range: str  # e.g. "A1:F2000"
+    condition: str  # BooleanCondition type, e.g. "TEXT_EQ"
+    values: list[str]  # condition values
+    background: str  # hex color, e.g. "#57bb8a"
+    bold: bool = False
+
+
+@dataclass(slots=True)
+class _StagedGrid:
+    worksheet_name: str
+    grid: Grid
+    start_cell: str = "A1"
+    frozen_rows: int | None = None
+    frozen_cols: int | None = None
+    conditional_formats: list[ConditionalFormat] = field(default_factory=list)
+
+
+class ReportWriter:
+    """
+    Collects rendered result grids and sends them to a spreadsheet in as few API calls as possible
+
+    Every staged grid is written by one values batch update, and any frozen rows/columns
+        and conditional formats by one formatting batch update after it, no matter how many
+        worksheets are involved.
+
+    With `diff_only`, the last grid written to each worksheet is kept in a local cache
+        (or read back once from the spreadsheet when there is no cached copy), and only
+        the cells that changed since are sent. Nothing is sent when nothing changed.
+    """
+    def __init__(
+        self,
+        *,
+        diff_only: bool = True,
+        cache_path: Path | None = None,
+        read_back: bool = True,
+        metrics: Metrics | None = None,
+    ):
+        self.diff_only = diff_only
+        self.read_back = read_back  # read a worksheet once when it has no cached copy
+        if cache_path is None:
+            cache_path = Path(__file__).parent.parent / "data" / "report_cache.json"
+        self.cache_path = cache_path
+        self._staged: list[_StagedGrid] = []
+        self._lock = threading.Lock()  # staging and flushing may happen on different threads
+        self._cache: dict[str, dict[str, dict]] | None = None  # spreadsheet id -> worksheet name -> entry
+        self.metrics = metrics if metrics is not None else get_metrics()  # counts Sheets calls and cells
+
+    def stage(
+        self,
+        worksheet_name: str,
+        grid: Grid,
+        start_cell: str = "A1",
+        frozen_rows: int | None = None,
+        frozen_cols: int | None = None,
+        conditional_formats: list[ConditionalFormat] | None = None,
+    ):
+        """
+        Queue a grid of values to be written on the next flush
+
+        :param worksheet_name: Title of the target worksheet
+        :type worksheet_name: str
+        :param grid: Rows of cell values, None to leave a cell as is
+        :type grid: Grid
+        :param start_cell: Top left cell of the grid, in A1 notation
+        :type start_cell: str
+        :param frozen_rows: Number of rows to freeze, if any
+        :type frozen_rows: int | None
+        :param frozen_cols: Number of columns to freeze, if any
+        :type frozen_cols: int | None
+        :param conditional_formats: Rules replacing the worksheet's conditional formatting, if any
+        :type conditional_formats: list[ConditionalFormat] | None
+        """
+        with self._lock:
+            self._staged.append(_StagedGrid(
+                worksheet_name,
+                grid,
+                start_cell,
+                frozen_rows,
+                frozen_cols,
+                conditional_formats if conditional_formats else [],
+            ))
+
+    def flush(self, spreadsheet: "Spreadsheet"):
+        """
+        Send everything staged so far to the spreadsheet
+
+        :param spreadsheet: Spreadsheet holding every staged worksheet
+        :type spreadsheet: Spreadsheet
+        """
+        from gspread.utils import a1_to_rowcol, absolute_range_name, rowcol_to_a1
+
+        with self._lock:
+            staged, self._staged = self._staged, []
+        if not staged:
+            return
+        previous = self._previous_entries(spreadsheet, staged) if self.diff_only else {}
+
+        data = []
+        to_freeze = []
+        to_format = []
+        written = {}
+        for entry in staged:
+            entry_previous = previous.get(entry.worksheet_name)
+            if entry_previous is not None and entry_previous["start_cell"] != entry.start_cell:
+                entry_previous = None  # grid moved, nothing to diff against
+
+            if entry_previous is None:
+                blocks = [(0, 0, entry.grid)] if entry.grid else []
+                previous_grid = []
+            else:
+                previous_grid = entry_previous["grid"]
+                blocks = _changed_blocks(entry.grid, previous_grid)
+            start_row, start_col = a1_to_rowcol(entry.start_cell)
+            for row_offset, col_offset, values in blocks:
+                data.append({
+                    "range": absolute_range_name(
+                        entry.worksheet_name,
+                        rowcol_to_a1(start_row + row_offset, start_col + col_offset),
+                    ),
+                    "values": values,
+                })
+
+            frozen = [entry.frozen_rows, entry.frozen_cols]
+            if frozen != [None, None] and (entry_previous is None or entry_previous.get("frozen") != frozen):
+                to_freeze.append(entry)
+            conditional_formats = [asdict(rule) for rule in entry.conditional_formats]
+            if conditional_formats and (
+                entry_previous is None or entry_previous.get("conditional_formats") != conditional_formats
+            ):
+                to_format.append(entry)
+            written[entry.worksheet_name] = {
+                "start_cell": entry.start_cell,
+                "grid": _merge_grids(entry.grid, previous_grid),
+                "frozen": frozen,
+                "conditional_formats": conditional_formats,
+            }
+
+        if data:
+            spreadsheet.values_batch_update({"valueInputOption": "RAW", "data": data})
+            self.metrics.count("sheets_calls")
+            self.metrics.count("sheets_cells", sum(
+                value is not None
+                for value_range in data
+                for row in value_range["values"]
+                for value in row
+            ))
+        if to_freeze or to_format:
+            # formatting goes after the values, so the worksheets hold their data first
+            self._send_formatting(spreadsheet, to_freeze, to_format)
+        if self.diff_only:
+            with self._lock:
+                self._load_cache().setdefault(spreadsheet.id, {}).update(written)
+                self._save_cache()
+
+    # private helpers
+    def _send_formatting(
+        self,
+        spreadsheet: "Spreadsheet",
+        to_freeze: list[_StagedGrid],
+        to_format: list[_StagedGrid],
+    ):
+        """
+        Freeze rows/columns and replace conditional formats, in one batch update
+        """
+        metadata = spreadsheet.fetch_sheet_metadata()
+        self.metrics.count("sheets_calls")
+        sheets = {sheet["properties"]["title"]: sheet for sheet in metadata.get("sheets", [])}
+
+        requests = []
+        for entry in to_freeze:
+            requests.append(_frozen_request(
+                sheets[entry.worksheet_name]["properties"]["sheetId"],
+                entry.frozen_rows,
+                entry.frozen_cols,
+            ))
+        for entry in to_format:
+            sheet = sheets[entry.worksheet_name]
+            sheet_id = sheet["properties"]["sheetId"]
+            existing = len(sheet.get("conditionalFormats", []))
+            requests.extend(
+                {"deleteConditionalFormatRule": {"sheetId": sheet_id, "index": index}}
+                for index in reversed(range(existing))
+            )
+            requests.extend(
+                {"addConditionalFormatRule": {"rule": _conditional_format_rule(rule, sheet_id), "index": index}}
+                for index, rule in enumerate(entry.conditional_formats)
+            )
+        spreadsheet.batch_update({"requests": requests})
+        self.metrics.count("sheets_calls")
+
+    def _previous_entries(self, spreadsheet: "Spreadsheet", staged: list[_StagedGrid]) -> dict[str, dict]:
+        """
+        Last known contents of each staged worksheet, from the cache or read back in one call
+        """
+        from gspread.utils import absolute_range_name
+
+        with self._lock:
+            previous = dict(self._load_cache().get(spreadsheet.id, {}))
+        missing = [
+            entry for entry in staged
+            if entry.worksheet_name not in previous
+        ]
+        if missing and self.read_back:
+            response = spreadsheet.values_batch_get([
+                absolute_range_name(entry.worksheet_name, entry.start_cell + ":ZZ")
+                for entry in missing
+            ])
+            self.metrics.count("sheets_calls")
+            for entry, value_range in zip(missing, response.get("valueRanges", [])):
+                previous[entry.worksheet_name] = {
+                    "start_cell": entry.start_cell,
+                    # only diff within the new grid, never blank cells we did not write
+                    "grid": [
+                        row[:len(new_row)]
+                        for row, new_row in zip(value_range.get("values", []), entry.grid)
+                    ],
+                }
+        return previous
+
+    def _load_cache(self) -> dict[str, dict[str, dict]]:
+        if self._cache is None:
+            try:
+                with open(self.cache_path, "r") as cache_file:
+                    self._cache = json.load(cache_file)
+            except FileNotFoundError:
+                self._cache = {}
+        return self._cache
+
+    def _save_cache(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, "w") as cache_file:
+            json.dump(self._cache, cache_file)
+
+
+def _frozen_request(sheet_id: int, rows: int | None, cols: int | None) -> dict:
+    grid_properties = {}
+    if rows is not None:
+        grid_properties["frozenRowCount"] = rows
+    if cols is not None:
+        grid_properties["frozenColumnCount"] = cols
+    return {
+        "updateSheetProperties": {
+            "properties": {"sheetId": sheet_id, "gridProperties": grid_properties},
+            "fields": ",".join(f"gridProperties.{name}" for name in grid_properties),
+        }
+    }
+
+
+def _conditional_format_rule(rule: ConditionalFormat, sheet_id: int) -> dict:
+    from gspread.utils import a1_range_to_grid_range
+    import gspread_formatting as gsf
+
+    return gsf.ConditionalFormatRule(
+        ranges=[gsf.GridRange.from_props(a1_range_to_grid_range(rule.a1_range, sheet_id))],
+        booleanRule=gsf.BooleanRule(
+            condition=gsf.BooleanCondition(rule.condition, rule.values),
+            format=gsf.CellFormat(
+                textFormat=gsf.TextFormat(bold=rule.bold),
+                backgroundColor=gsf.Color.fromHex(rule.background),
+            ),
+        ),
+    ).to_props()
+
+
+def _changed_blocks(grid: Grid, previous: Grid) -> list[tuple[int, int, Grid]]:
+    """
+    Cells of `grid` that differ from `previous`, as (row offset, col offset, values) blocks
+
+    Cells that were written before but are no longer in `grid` are blanked.
+        Runs of changed cells in a row become one block, and runs spanning the same
+        columns on consecutive rows are merged.
+    """
+    blocks: list[tuple[int, int, Grid]] = []
+    last_row = {}  # (col offset, width) -> (row offset of last run, block index)
+    for row in range(max(len(grid), len(previous))):
+        new_row = grid[row] if row < len(grid) else []
+        old_row = previous[row] if row < len(previous) else []
+        run_start = None
+        run: list[str | None] = []
+        for col in range(max(len(new_row), len(old_row)) + 1):
+            changed = False
+            value = None
+            if col < len(new_row):
+                value = new_row[col]
+                old_value = old_row[col] if col < len(old_row) else None
+                changed = value is not None and value != old_value
+            elif col < len(old_row) and old_row[col] not in (None, ""):
+                value = ""  # stale cell from an earlier write
+                changed = True
+
+            if changed:
+                if run_start is None:
+                    run_start = col
+                run.append(value)
+                continue
+            if run_start is None:
+                continue
+            key = (run_start, len(run))
+            if key in last_row and last_row[key][0] == row - 1:
+                block_index = last_row[key][1]
+                blocks[block_index][2].append(run)
+            else:
+                block_index = len(blocks)
+                blocks.append((row, run_start, [run]))
+            last_row[key] = (row, block_index)
+            run_start = None
+            run = []
+    return blocks
+
+
+def _merge_grids(grid: Grid, previous: Grid) -> Grid:
+    """
+    Contents of the written area after `grid` is applied over `previous`
+    """
+    merged = []
+    for row, new_row in enumerate(grid):
+        old_row = previous[row] if row < len(previous) else []
+        merged.append([
+            value if value is not None else (old_row[col] if col < len(old_row) else None)
+            for col, value in enumerate(new_row)
+        ])
+    return merged
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+
+from src.ScoreStore import to_timestamp
+
+
+class ReplayMissError(LookupError):
+    """
+    Raised in replay mode when a request has no cached response to replay
+    """
+
+
+class ResponseCache:
+    """
+    On-disk cache of SMX.573.no API responses, keyed by url and normalized params
+
+    Responses for a closed time window (an upper `created_at` bound comfortably in the past)
+        are kept for `closed_window_ttl`, everything else for `open_window_ttl`. Incremental
+        (`updated_at`) queries are never cached, since they only exist to find new data.
+        In replay mode every cached response is served regardless of age, and nothing
+        goes to the network, so a run can be repeated offline.
+
+    Expired responses are deleted when next looked up, and by prune.
+    """
+    def __init__(
+        self,
+        path: Path,
+        *,
+        open_window_ttl: float = 60.0,
+        closed_window_ttl: float = 24 * 60 * 60.0,
+        closed_window_grace: float = 60 * 60.0,
+        replay: bool = False,
+    ):
+        self.path = path
+        self.open_window_ttl = open_window_ttl  # seconds
+        self.closed_window_ttl = closed_window_ttl  # seconds
+        self.closed_window_grace = closed_window_grace  # seconds a window stays open after its end
+        self.replay = replay
+
+    def key(self, url: str, params: dict | None = None) -> str:
+        normalized = json.dumps([url, params or {}], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def ttl(self, params: dict | None = None) -> float:
+        """
+        Seconds a response for these params stays fresh
+        """
+        params = params or {}
+        if "updated_at" in params:  # incremental queries always look for new data
+            return 0.0
+        created_at: dict = params.get("created_at") or {}
+        end = created_at.get("lte", created_at.get("lt"))
+        if end is None:
+            return self.open_window_ttl
+        closed_since = datetime.now(UTC).timestamp() - to_timestamp(end)
+        if closed_since > self.closed_window_grace:
+            return self.closed_window_ttl
+        return self.open_window_ttl
+
+    def get(self, url: str, params: dict | None = None) -> str | None:
+        """
+        Cached response body, if there is a fresh one (or any one, in replay mode)
+        """
+        filepath = self._filepath(self.key(url, params))
+        try:
+            with open(filepath, "r") as cache_file:
+                entry = json.load(cache_file)
+        except FileNotFoundError:
+            return None
+        if not self.replay and time.time() - entry["fetched_at"] > self.ttl(params):
+            filepath.unlink(missing_ok=True)
+            return None
+        return entry["body"]
+
+    def put(self, url: str, params: dict | None, body: str):
+        if self.ttl(params) <= 0:
+            return
+        filepath = self._filepath(self.key(url, params))
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, "w") as cache_file:
+            json.dump({"fetched_at": time.time(), "url": url, "params": params, "body": body}, cache_file)
+
+    def prune(self) -> int:
+        """
+        Delete every expired response, e.g. ones keyed by an old sync time that is never asked for again
+
+        Does nothing in replay mode, where every response is kept
+
+        :return: Number of responses deleted
+        :rtype: int
+        """
+        if self.replay or not self.path.exists():
+            return 0
+        now = time.time()
+        deleted = 0
+        for filepath in self.path.glob("*/*.json"):
+            try:
+                with open(filepath, "r") as cache_file:
+                    entry = json.load(cache_file)
+                expired = now - entry["fetched_at"] > self.ttl(entry.get("params"))
+            except (OSError, ValueError, KeyError):
+                expired = True  # unreadable, so of no use
+            if expired:
+                filepath.unlink(missing_ok=True)
+                deleted += 1
+        return deleted
+
+    # private helpers
+    def _filepath(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
@@ -4,7 +4,7 @@ from src.Chart import Chart
 from src.Song import Song
 from src.Gamer import Gamer
 
-@dataclass
+@dataclass(slots=True)
 class Score:
     _id: int
     calories: int
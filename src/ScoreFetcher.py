@@ -1,13 +1,55 @@
 import asyncio
-import aiohttp
 import json
+import random
+import threading
+import time
 from datetime import datetime, UTC
 from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import quote
 
+from src.Catalog import Catalog
+from src.CatalogCache import CatalogCache
 from src.Chart import Chart
 from src.Gamer import Gamer
+from src.Metrics import Metrics, get_metrics
+from src.RateLimiter import RateLimiter
+from src.ResponseCache import ReplayMissError, ResponseCache
 from src.Score import Score
 from src.Song import Song
+from src.ScoreStore import GamerSyncState, ScoreStore, to_timestamp
+
+# aiohttp is only imported once a batch of requests actually runs
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class CoroutineBatchError(Exception):
+    """
+    Raised when one or more coroutines in a batch failed
+
+    The rest of the batch is always allowed to finish, so `results` holds every
+    result in input order, with the raised exception in place of each failed result
+    """
+    def __init__(self, results: list, failures: dict[int, BaseException]):
+        self.results = results
+        self.failures = failures
+        summary = ", ".join(
+            f"[{index}] {type(error).__name__}: {error}"
+            for index, error in failures.items()
+        )
+        super().__init__(f"{len(failures)} of {len(results)} coroutines failed: {summary}")
+
+
+class FetchError(Exception):
+    """
+    Raised when an API request still fails after every retry
+    """
+    def __init__(self, url: str, status: int | None, reason: str):
+        self.url = url
+        self.status = status  # None when no response came back at all
+        self.reason = reason
+        super().__init__(f"{url} failed: {status} {reason}")
 
 
 class ScoreFetcher():
@@ -18,40 +60,166 @@ class ScoreFetcher():
 
     API results preformatted as data classes for simple consumption
     """
-    def __init__(self, *, debug: bool=False):
-        self.debug = debug
+    page_size = 100  # max elements per request, per API spec
 
-        self.data_path = Path(__file__).parent.parent / "data"
-        self.songs: list[Song] = []
-        self.charts: list[Chart] = []
+    def __init__(
+        self,
+        *,
+        debug: bool=False,
+        max_concurrency: int = 8,
+        page_prefetch: int = 4,
+        score_store_path: Path | None = None,
+        score_sync_interval: float = 60.0,
+        response_cache: ResponseCache | None = None,
+        replay: bool = False,
+        rate_limiter: RateLimiter | None = None,
+        max_retries: int = 4,
+        retry_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        api_url: str = "http://api.smx.573.no",
+        data_path: Path | None = None,
+        metrics: Metrics | None = None,
+    ):
+        self.debug = debug
+        self.max_concurrency = max_concurrency
+        self.page_prefetch = page_prefetch
+        self.score_sync_interval = score_sync_interval  # seconds a gamer sync is considered fresh
+
+        self.api_url = api_url.rstrip("/")  # e.g. a local mock API for benchmarks
+        if data_path is None:
+            data_path = Path(__file__).parent.parent / "data"
+        self.data_path = data_path
+        self.catalog = Catalog([], [])
+        self._song_cache = CatalogCache(self.data_path / 'songs')
+        self._chart_cache = CatalogCache(self.data_path / 'charts')
+        self._gamers_by_id: dict[int, Gamer] = {}  # shared Gamer per id for this run
+
+        # Local score store, synced incrementally per gamer
+        if score_store_path is None:
+            score_store_path = self.data_path / "scores.sqlite3"
+        self.score_store = ScoreStore(score_store_path)
+        self._sync_locks: dict[str, asyncio.Lock] = {}
+
+        # On-disk API response cache, and requests currently in flight by cache key
+        if response_cache is None:
+            response_cache = ResponseCache(self.data_path / "http_cache", replay=replay)
+        self.response_cache = response_cache
+        self.response_cache.prune()
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+        # Request throttling and retries of failed requests
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff  # seconds, doubled on every retry
+        self.max_backoff = max_backoff  # seconds
+
+        # Request, page and row counts of the run
+        if metrics is None:
+            metrics = get_metrics()
+        self.metrics = metrics
 
         # Event Loop and Session for API calls
         self._event_loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._event_loop)
-        self._session: aiohttp.ClientSession = None  # establish placeholder parameter
+        self._session: "aiohttp.ClientSession" = None  # establish placeholder parameter
 
         # Initialize song and chart lists
         coroutines = [
             self._load_songs(),
             self._load_charts(),
         ]
-        [self.songs, self.charts] = self.execute_coroutines(coroutines)
+        [songs, charts] = self.execute_coroutines(coroutines)
+        self.catalog = Catalog(songs, charts)
         if self.debug:
             print(str(len(self.songs)) + " songs loaded")
             print(str(len(self.charts)) + " charts loaded")
 
     def __del__(self):
         # Required to clean up event loop to avoid error on program end
+        if hasattr(self, "_event_loop"):
+            self.close()
+
+    def close(self):
+        """
+        Close the HTTP session, the event loop and the score store
+        """
+        if self._event_loop.is_closed():
+            return
+        try:
+            asyncio.get_running_loop()
+            loop_running = True  # e.g. garbage collected while another fetcher's loop runs
+        except RuntimeError:
+            loop_running = False
+        if self._session is not None:
+            if loop_running:
+                # our loop can't run on this thread while another one is, so close on it from a helper thread
+                closer = threading.Thread(
+                    target=self._event_loop.run_until_complete,
+                    args=(self._session.close(),),
+                    name="close-session",
+                )
+                closer.start()
+                closer.join()
+            else:
+                self._event_loop.run_until_complete(self._session.close())
+        self._session = None
         self._event_loop.close()
+        self.score_store.close()
+
+    @property
+    def songs(self) -> list[Song]:
+        return self.catalog.songs
+
+    @property
+    def charts(self) -> list[Chart]:
+        return self.catalog.charts
 
     # public functions
-    def execute_coroutines(self, coroutines):
+    def refresh_catalog(self) -> int:
         """
-        Runs a set of coroutines and returns the results
+        Add songs and charts released since the catalog was loaded, e.g. during a resident watch
+
+        Only entries updated since the previous catalog sync are requested. Entries that were
+            already known keep their current instance until the fetcher is rebuilt.
+
+        :return: Number of new or updated songs and charts
+        :rtype: int
+        """
+        [raw_songs, raw_charts] = self.execute_coroutines([
+            self._sync_catalog_cache(self._song_cache, f'{self.api_url}/songs'),
+            self._sync_catalog_cache(self._chart_cache, f'{self.api_url}/charts'),
+        ])
+        for raw_song in raw_songs:
+            self._get_song(raw_song)
+        for raw_chart in raw_charts:
+            self._get_chart(raw_chart)
+        return len(raw_songs) + len(raw_charts)
+
+    def execute_coroutines(self, coroutines, max_concurrency: int | None = None):
+        """
+        Runs a set of coroutines concurrently and returns the results in input order
+
+        A failing coroutine does not cancel the rest of the batch; once every coroutine
+            has finished, any failures are raised together as a CoroutineBatchError
 
         :param coroutines: Async function call that is awaitable
+        :param max_concurrency: Max number of coroutines in flight at once, defaults to self.max_concurrency
+        :type max_concurrency: int | None
         """
-        return self._event_loop.run_until_complete(self._run_tasks_in_aiohttp_client(coroutines))
+        if max_concurrency is None:
+            max_concurrency = self.max_concurrency
+        results = self._event_loop.run_until_complete(
+            self._run_tasks_in_aiohttp_client(coroutines, max_concurrency)
+        )
+        failures = {
+            index: result for index, result in enumerate(results)
+            if isinstance(result, BaseException)
+        }
+        if failures:
+            raise CoroutineBatchError(results, failures)
+        return results
 
     async def load_entrant_scores(
         self,
@@ -70,191 +238,481 @@ class ScoreFetcher():
         get_max_only: bool = False,
         take: int | None = None,
     ):
-        # Required params
-        params = {}
-        params['gamer.username'] = entrant_name
-
-        # Optional params
-        if start is not None or end is not None:
-            params['created_at'] = {}
-            if start:
-                params['created_at']['gte'] = str(start)
-            if end:
-                params['created_at']['lte'] = str(end)
+        """
+        Scores of an entrant matching the filters, as the API answers them
+
+        Only rows matching the filters that narrow the download (score, clear, difficulty
+            and chart filters, best per chart, and the first `take` rows in the given order)
+            are requested, and each combination of them is synced on its own like
+            sync_entrant_scores. The query is then answered from the local score store.
+        """
+        filters = {}
         if score_gte is not None or score_lte is not None:
-            params['score'] = {}
+            filters['score'] = {}
             if score_gte:
-                params['score']['gte'] = score_gte
+                filters['score']['gte'] = score_gte
             if score_lte:
-                params['score']['lte'] = score_lte
+                filters['score']['lte'] = score_lte
         if get_cleared_only:
-            params['cleared'] = True
+            filters['cleared'] = True
         if get_max_only:
-            params['_group_by'] = 'song_chart_id'
-        self._update_dict_if_not_null(params, 'chart.difficulty', difficulty)
-        self._update_dict_if_not_null(params, 'chart.difficulty_name', difficulty_names)
-        self._update_dict_if_not_null(params, 'chart.id', chart_ids)
-        self._update_dict_if_not_null(params, '_sort', sort_field)
-        self._update_dict_if_not_null(params, '_order', order)
-        self._update_dict_if_not_null(params, '_take', take)
-
-        data = await self._load_scores(params)
-        print(f"Returned {len(data)} scores for {entrant_name=}")
-        for score in data:
-            print('\t', score.score, '\t', score.chart.difficulty, '\t', score.song.title, )
+            filters['_group_by'] = 'song_chart_id'
+        self._update_dict_if_not_null(filters, 'chart.difficulty', difficulty)
+        self._update_dict_if_not_null(filters, 'chart.difficulty_name', difficulty_names)
+        self._update_dict_if_not_null(filters, 'chart.id', chart_ids)
+        if take is not None:  # the order only matters to which rows are taken
+            self._update_dict_if_not_null(filters, '_sort', sort_field)
+            self._update_dict_if_not_null(filters, '_order', order)
+            filters['_take'] = take
+
+        await self._sync_scores(entrant_name, start, end, filters)
+        rows = self.score_store.query_scores(
+            gamer=entrant_name,
+            start=start,
+            end=end,
+            score_gte=score_gte,
+            score_lte=score_lte,
+            difficulty=difficulty,
+            difficulty_names=difficulty_names,
+            chart_ids=chart_ids,
+            sort_field=sort_field,
+            order=order,
+            get_cleared_only=get_cleared_only,
+            get_max_only=get_max_only,
+            take=take,
+        )
+        data = [self._decode_stored_score(*row) for row in rows]
+        self.metrics.count("scores_returned", len(data))
         return data
 
+    async def load_stored_entrant_scores(
+        self,
+        *,
+        entrant_name: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        score_gte: int | None = None,
+        score_lte: int | None = None,
+        difficulty: list[int] | None = None,
+        difficulty_names: str | list[str] | None = None,
+        chart_ids: list[int] | None = None,
+        sort_field: str | None = None,
+        order: str | None = None,
+        get_cleared_only: bool = False,
+        get_max_only: bool = False,
+        take: int | None = None,
+    ) -> list[Score]:
+        """
+        Same filters as load_entrant_scores, answered from the local score store
+
+        The entrant's scores within [start, end] are synced first, which after the
+            first run only downloads scores created or updated since the previous sync
+        """
+        await self.sync_entrant_scores(entrant_name=entrant_name, start=start, end=end)
+        rows = self.score_store.query_scores(
+            gamer=entrant_name,
+            start=start,
+            end=end,
+            score_gte=score_gte,
+            score_lte=score_lte,
+            difficulty=difficulty,
+            difficulty_names=difficulty_names,
+            chart_ids=chart_ids,
+            sort_field=sort_field,
+            order=order,
+            get_cleared_only=get_cleared_only,
+            get_max_only=get_max_only,
+            take=take,
+        )
+        data = [self._decode_stored_score(*row) for row in rows]
+        self.metrics.count("scores_returned", len(data))
+        return data
+
+    def query_stored_scores(self, *, entrant_name: str, **filters) -> list[Score]:
+        """
+        Scores already in the local score store, without syncing first
+
+        Takes the same filters as load_entrant_scores
+        """
+        rows = self.score_store.query_scores(gamer=entrant_name, **filters)
+        return [self._decode_stored_score(*row) for row in rows]
+
+    async def sync_entrant_scores(
+        self,
+        *,
+        entrant_name: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> int:
+        """
+        Bring the local score store up to date for an entrant, for scores created within [start, end]
+
+        If the store already covers the window, only scores updated at or after the
+            high-water mark of the previous sync are requested. Otherwise all scores
+            created within the window are. A window that has not ended yet is synced up
+            to the present, so scores played from now on are picked up too.
+
+        :param entrant_name: Gamer username
+        :type entrant_name: str
+        :param start: Earliest score creation time needed, None for the whole history
+        :type start: datetime | None
+        :param end: Latest score creation time needed, None for up to the present
+        :type end: datetime | None
+        :return: Number of scores written to the store
+        :rtype: int
+        """
+        return await self._sync_scores(entrant_name, start, end, {})
+
     # private helpers
+    async def _sync_scores(
+        self,
+        entrant_name: str,
+        start: datetime | None,
+        end: datetime | None,
+        filters: dict,
+    ) -> int:
+        """
+        Sync an entrant's scores created within [start, end] that match `filters`, as sync_entrant_scores
+
+        Every distinct set of filters keeps its own sync state, the empty set being the
+            entrant's full score history. The window is part of the state only with `_take`,
+            since the first rows of a window are not the first rows of a wider one.
+        """
+        fingerprint = dict(filters)
+        if '_take' in filters:
+            fingerprint['created_at'] = [str(start) if start else None, str(end) if end else None]
+        query = json.dumps(fingerprint, sort_keys=True) if fingerprint else ""
+        lock = self._sync_locks.setdefault(f"{entrant_name.casefold()} {query}", asyncio.Lock())
+        async with lock:  # concurrent searches for one entrant and query share a single sync
+            curr_time = datetime.now(UTC)
+            start_ts = to_timestamp(start) if start else None
+            end_ts = to_timestamp(end) if end else None
+            if end_ts is not None and end_ts >= curr_time.timestamp():
+                end_ts = None  # still running
+            state = self.score_store.get_sync_state(entrant_name, query)
+            covered = state is not None and state.covers(start_ts, end_ts)
+            if covered and self._is_fresh(state):
+                return 0
+
+            params = {'gamer.username': entrant_name, **filters}
+            high_water_mark = None
+            if covered and state.high_water_mark is not None:
+                params['updated_at'] = {'gte': state.high_water_mark}
+                high_water_mark = state.high_water_mark
+                synced_from = state.synced_from
+                # once a window has ended, stop following scores created after it
+                synced_to = state.synced_to if state.synced_to is not None else end_ts
+            else:
+                synced_from, synced_to = start_ts, end_ts
+            if synced_from is not None or synced_to is not None:
+                params['created_at'] = {}
+                if synced_from is not None:
+                    params['created_at']['gte'] = str(datetime.fromtimestamp(synced_from, UTC))
+                if synced_to is not None:
+                    params['created_at']['lte'] = str(datetime.fromtimestamp(synced_to, UTC))
+            raw_scores = await self._load_from_url(f'{self.api_url}/scores', params)
+
+            count = self._store_scores(raw_scores)
+            self.score_store.set_sync_state(
+                entrant_name,
+                GamerSyncState(
+                    synced_from=synced_from,
+                    synced_to=synced_to,
+                    synced_at=str(curr_time),
+                    high_water_mark=_high_water_mark(raw_scores, high_water_mark),
+                ),
+                query,
+            )
+            return count
+
+    def _store_scores(self, raw_scores: list[dict]) -> int:
+        """
+        Upsert raw API score rows, adding any chart or song newer than the catalog first
+
+        Stored scores are rejoined with the catalog when read, so a chart released since
+            the last catalog sync has to be known before its scores are
+        """
+        for raw_score in raw_scores:
+            self._get_chart(raw_score["chart"])
+            self._get_song(raw_score["song"])
+        return self.score_store.upsert_scores(raw_scores)
+
+    def _is_fresh(self, state: GamerSyncState) -> bool:
+        age = datetime.now(UTC) - datetime.fromisoformat(state.synced_at)
+        return age.total_seconds() < self.score_sync_interval
+
+    def _decode_stored_score(self, chart_id: int, song_id: int, raw_score: dict) -> Score:
+        """
+        Build a Score from a stored row, on the catalog's shared Chart and Song instances
+        """
+        chart = self.catalog.get_chart(chart_id)
+        song = self.catalog.get_song(song_id)
+        if chart is None or song is None:
+            raise KeyError(f"Stored score {raw_score['id']} refers to chart {chart_id} / song {song_id}, missing from catalog")
+        raw_score["chart"] = chart
+        raw_score["song"] = song
+        raw_score["gamer"] = self._get_gamer(raw_score["gamer"])
+        return Score(**raw_score)
+
+    def _get_chart(self, raw_chart: dict) -> Chart:
+        chart = self.catalog.get_chart(raw_chart["id"])
+        if chart is None:  # newer than the catalog, keep it for the rest of the run
+            chart = Chart(**raw_chart)
+            self.catalog.add_chart(chart)
+        return chart
+
+    def _get_song(self, raw_song: dict) -> Song:
+        song = self.catalog.get_song(raw_song["id"])
+        if song is None:  # newer than the catalog, keep it for the rest of the run
+            song = Song(**raw_song)
+            self.catalog.add_song(song)
+        return song
+
+    def _get_gamer(self, raw_gamer: dict) -> Gamer:
+        gamer = self._gamers_by_id.get(raw_gamer["id"])
+        if gamer is None:
+            gamer = self._gamers_by_id[raw_gamer["id"]] = Gamer(**raw_gamer)
+        return gamer
+
     def _update_dict_if_not_null(self, dict, key, value):
         if value is not None:
             dict[key] = value
 
     # private helpers - async
-    async def _run_tasks_in_aiohttp_client(self, coroutines):
-        results = []
-        async with aiohttp.ClientSession() as session:
-            self._session = session
-            for coroutine in coroutines:
-                result = await coroutine
-                results.append(result)
-        self._session = None  # reset after close
-        return results
-
-    async def _load_from_url(self, url: str, params: dict | None = None):
+    async def _run_tasks_in_aiohttp_client(self, coroutines, max_concurrency: int):
+        import aiohttp
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+        async def run_bounded(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        # one session is kept for the fetcher's lifetime, so connections are reused across batches
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        # return_exceptions keeps one failure from cancelling the rest of the batch
+        return await asyncio.gather(
+            *[run_bounded(coroutine) for coroutine in coroutines],
+            return_exceptions=True,
+        )
+
+    async def _load_from_url(self, url: str, params: dict | None = None, prefetch_pages: int | None = None):
         """
         Load all results from SMX.573.no API for given url and params
+
+        The first page is requested alone, so short results cost a single request.
+            If it comes back full, the following pages are requested `prefetch_pages`
+            at a time until a short page (or the `_take` cap) marks the end of the data.
         
         :param url: Base url for the API call
         :type url: str
         :param params: Dict of parameters w/ values, if any
         :type params: dict | None
+        :param prefetch_pages: Number of pages to request at once, defaults to self.page_prefetch
+        :type prefetch_pages: int | None
         """
         if params is None:
             params = {}
+        if prefetch_pages is None:
+            prefetch_pages = self.page_prefetch
         data = []
+        skip = 0
+        wave_size = 1
         complete = False
-        params['_skip'] = 0
-
-        # take at most 100 elements per request, per API spec
         initial_take = params.get('_take', None)
-        params['_take'] = initial_take if initial_take is not None and initial_take < 100 else 100
         while not complete:
-            # grab next set of data
-            data += await self._load_from_url_single(url, params)
-
-            # update count of records searched
-            params['_skip'] += params['_take']
-
-            # update take param to not excede initial_take, if necessary
-            if initial_take is not None:
-                params['_take'] = min(initial_take - params['_skip'], 100)
-
-            # exit conditions
-            if len(data) < params['_skip']:  # reached end of data, quit
-                complete = True
-            if len(data) == initial_take:  # reached requisite # of entries, quit
-                complete = True
+            # build the next wave of page requests, never asking past initial_take
+            pages = []
+            for _ in range(wave_size):
+                take = self.page_size
+                if initial_take is not None:
+                    take = min(initial_take - skip, self.page_size)
+                if take <= 0:
+                    break
+                pages.append({**params, '_skip': skip, '_take': take})
+                skip += take
+            if not pages:  # reached requisite # of entries, quit
+                break
+
+            results = await asyncio.gather(*[
+                self._load_from_url_single(url, page_params)
+                for page_params in pages
+            ])
+            for page_params, page in zip(pages, results):
+                data += page
+                if len(page) < page_params['_take']:  # reached end of data, quit
+                    # any pages requested past this point are empty, drop them
+                    complete = True
+                    break
+            wave_size = max(prefetch_pages, 1)
+        self.metrics.count("rows", len(data))
         return data
 
     async def _load_from_url_single(self, url: str, params: dict | None = None):
         """
         private helper for actually executing the API request via url + parameters
 
+        Served from the response cache when possible. Identical requests already in
+            flight share a single network call.
+
         :param url: Base url for the API call
         :type url: str
         :param params: Dict of parameters w/ values, if any
         :type params: dict | None
         """
+        self.metrics.count("pages")
+        body = self.response_cache.get(url, params)
+        if body is None:
+            if self.response_cache.replay:
+                if params and 'updated_at' in params:
+                    return []  # replaying offline, so nothing was updated since the last sync
+                raise ReplayMissError(f"No cached response to replay for {url} {params=}")
+            key = self.response_cache.key(url, params)
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                in_flight = asyncio.ensure_future(self._request(url, params))
+                self._in_flight[key] = in_flight
+                in_flight.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            else:
+                self.metrics.count("coalesced_requests")
+            body = await asyncio.shield(in_flight)
+        else:
+            self.metrics.count("cache_hits")
+        # each caller parses its own copy, since decoding mutates the rows
+        return json.loads(body)
+
+    async def _request(self, url: str, params: dict | None = None) -> str:
+        """
+        Send one API request, caching the response body on success
+
+        Requests are throttled by the rate limiter. Connection errors, 429s and 5xx
+            responses are retried with jittered exponential backoff (or the server's
+            Retry-After), any other non-200 response fails right away.
+
+        :raises FetchError: If the request did not succeed within `max_retries` retries
+        """
+        import aiohttp
+
         # grab active session from instance variable
-        session: aiohttp.ClientSession = self._session
+        session: "aiohttp.ClientSession" = self._session
+        request_url = url
         if params is not None:
             if self.debug:
                 print(f"{params=}")
-            url = f'{url}?params={json.dumps(params)}'
+            # encoded, or the "+" of a UTC offset would reach the API as a space
+            request_url = f'{url}?params={quote(json.dumps(params))}'
         if self.debug:
-            print(f"{url=}")
-        response = await session.request('GET', url=url)
-        if response.status != 200:
-            # TODO: error handling
-            print(url, response.status, response.reason)
-            return {}
-        data = await response.json()
-        return data
-
-    async def _load_data_incremental(self, filepath: Path, base_api_url: str):
+            print(f"{request_url=}")
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            await self.rate_limiter.acquire()
+            self.metrics.count("http_requests")
+            started = time.monotonic()
+            throttled = False
+            try:
+                try:
+                    async with session.request('GET', url=request_url) as response:
+                        status, reason = response.status, response.reason
+                        if status == 200:
+                            body = await response.text()
+                        elif 'Retry-After' in response.headers:
+                            try:
+                                retry_after = float(response.headers['Retry-After'])
+                            except ValueError:
+                                pass  # HTTP date, fall back to our own backoff
+                except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                    status, reason = None, f"{type(error).__name__}: {error}"
+                throttled = status is None or status == 429 or status >= 500
+            finally:
+                # the slot is freed even if the request is cancelled or fails unexpectedly
+                await self.rate_limiter.release(
+                    latency=time.monotonic() - started,
+                    throttled=throttled,
+                    retry_after=retry_after,
+                )
+
+            if status == 200:
+                self.metrics.count("http_bytes", len(body.encode()))
+                self.response_cache.put(url, params, body)
+                return body
+            if not throttled:
+                raise FetchError(request_url, status, reason)
+            if attempt < self.max_retries:
+                self.metrics.count("http_retries")
+                backoff = retry_after
+                if backoff is None:
+                    backoff = random.uniform(0, min(self.max_backoff, self.retry_backoff * 2 ** attempt))
+                print(f"{request_url} {status} {reason}, retrying in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+        raise FetchError(request_url, status, reason)
+
+    async def _load_data_incremental(self, cache: CatalogCache, base_api_url: str):
         """
-        Load data from a file, augment w/ updated info from API, then save back to file
+        Load data from the local catalog cache, augmented w/ updated info from the API
 
-        :param filepath: Description
-        :param base_api_url: Description
+        :param cache: Catalog cache of the API (e.g. data/songs)
+        :type cache: CatalogCache
+        :param base_api_url: Base url of the catalog API
+        :type base_api_url: str
         """
-        time_fmt = "%a, %b %d %Y %H:%M:%S"
-        upd_at_filepath = str(filepath) + '_updated_at.txt'
-        data_filepath = str(filepath) + '_data.json'
+        cache.load()
+        await self._sync_catalog_cache(cache, base_api_url)
+        return list(cache.entries.values())
 
-        # get previous timestamp from file
-        try:
-            with open(upd_at_filepath, 'r') as upd_file:
-                prev_upd_at = datetime.strptime(upd_file.read(), time_fmt)
-                previous_search = True
-        except FileNotFoundError:
-            previous_search = False
+    async def _sync_catalog_cache(self, cache: CatalogCache, base_api_url: str) -> list[dict]:
+        """
+        Request catalog entries updated since the cache's previous sync, and log them
 
-        # get existing data from file
-        try:
-            with open(data_filepath, "r") as data_file:
-                data: list = json.load(data_file)
-        except FileNotFoundError:
-            data: list = []
+        They are appended to the cache log instead of rewriting the whole catalog.
 
+        :return: The new or updated raw entries
+        :rtype: list[dict]
+        """
         # grab current timestamp before beginning data operations
         # API uses UTC for lookup
         curr_time = datetime.now(UTC)
 
         # query API for data updated since previous timestamp
         params = {}
-        if previous_search:
-            params = {"updated_at": {"gt": str(prev_upd_at)}}
+        if cache.synced_at is not None:
+            params = {"updated_at": {"gt": cache.synced_at}}
         new_data = await self._load_from_url(base_api_url, params)
 
-        # merge new data into existing
-        ids_to_update = [entry['id'] for entry in new_data]
-        data = [entry for entry in data if entry['id'] not in ids_to_update]
-        for entry in new_data:
-            data.append(entry)
-
-        # save data to file
-        with open(data_filepath, "w") as data_file:
-            json.dump(data, data_file)
-        
-        # save timestamp to file
-        with open(upd_at_filepath, "w") as upd_file:
-            upd_file.write(datetime.strftime(curr_time, time_fmt))
-
-        return data
+        cache.append(new_data, str(curr_time))
+        return new_data
 
     async def _load_songs(self) -> list[Song]:
-        filepath = self.data_path / 'songs'
-        url = 'http://api.smx.573.no/songs'
-        data = await self._load_data_incremental(filepath, url)
+        url = f'{self.api_url}/songs'
+        data = await self._load_data_incremental(self._song_cache, url)
         data = [Song(**song) for song in data]
         return data
 
     async def _load_charts(self) -> list[Chart]:
-        filepath = self.data_path / 'charts'
-        url = 'http://api.smx.573.no/charts'
-        data = await self._load_data_incremental(filepath, url)
+        url = f'{self.api_url}/charts'
+        data = await self._load_data_incremental(self._chart_cache, url)
         data = [Chart(**chart) for chart in data]
         return data
 
-    # could be made public
-    async def _load_scores(self, params) -> list[Score]:
-        url = 'http://api.smx.573.no/scores'
-        data = await self._load_from_url(url, params)
-        scores = []
-        for raw_score in data:
-            raw_score["chart"] = Chart(**raw_score["chart"])
-            raw_score["song"] = Song(**raw_score["song"])
-            raw_score["gamer"] = Gamer(**raw_score["gamer"])
-            scores.append(Score(**raw_score))
-        return scores
+
+def _high_water_mark(raw_scores: list[dict], previous: str | None = None) -> str | None:
+    """
+    Latest updated_at among raw API score rows, or `previous` if it is later
+    """
+    candidates = [raw_score['updated_at'] for raw_score in raw_scores]
+    if previous is not None:
+        candidates.append(previous)
+    return max(candidates, key=to_timestamp, default=None)
+
+
+_default_score_fetcher: ScoreFetcher | None = None
+
+
+def get_score_fetcher() -> ScoreFetcher:
+    """
+    Shared ScoreFetcher, built (and synced with the song/chart catalog) on first use
+    """
+    global _default_score_fetcher
+    if _default_score_fetcher is None:
+        _default_score_fetcher = ScoreFetcher()
+    return _default_score_fetcher
@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.Score import Score
+from src.ScoreStore import to_timestamp
+
+
+class ScoreFrame:
+    """
+    Column-oriented table of scores, for vectorized tournament standings
+
+    One row per score, with columns for the entrant, chart id, difficulty, difficulty name,
+        score, cleared flag and created_at timestamp. Only the aggregation is columnar: frames
+        are built from decoded Score objects, then filters, per chart group-bys and per entrant
+        orderings are pandas operations instead of Python loops. Each row keeps a reference
+        to its Score, so results are still reported from Score objects.
+    """
+    columns = ["entrant", "chart_id", "difficulty", "difficulty_name", "score", "cleared", "created_at"]
+
+    def __init__(self, frame: pd.DataFrame, scores: list[Score]):
+        self.frame = frame  # columns, plus "row", the position of each row's Score in `scores`
+        self._scores = scores
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @classmethod
+    def from_scores(cls, scores_by_entrant: dict[str, list[Score]]) -> "ScoreFrame":
+        """
+        Build a ScoreFrame from each entrant's Score objects
+
+        :param scores_by_entrant: Entrant name -> scores, rows keep this order
+        :type scores_by_entrant: dict[str, list[Score]]
+        """
+        scores = [score for entrant_scores in scores_by_entrant.values() for score in entrant_scores]
+        frame = pd.DataFrame({
+            "entrant": np.repeat(
+                list(scores_by_entrant.keys()),
+                [len(entrant_scores) for entrant_scores in scores_by_entrant.values()],
+            ).astype(object),
+            "chart_id": np.fromiter((score.song_chart_id for score in scores), dtype=np.int64, count=len(scores)),
+            "difficulty": np.fromiter((score.chart.difficulty for score in scores), dtype=np.int64, count=len(scores)),
+            "difficulty_name": [score.chart.difficulty_name for score in scores],
+            "score": np.fromiter((score.score for score in scores), dtype=np.int64, count=len(scores)),
+            "cleared": np.fromiter((score.cleared for score in scores), dtype=bool, count=len(scores)),
+            "created_at": np.fromiter(
+                (to_timestamp(score.created_at) for score in scores), dtype=np.float64, count=len(scores)
+            ),
+            "row": np.arange(len(scores)),
+        })
+        return cls(frame, scores)
+
+    # derived frames
+    def filter(
+        self,
+        *,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+        chart_ids: list[int] | None = None,
+        difficulty_names: str | list[str] | None = None,
+        cleared_only: bool = False,
+    ) -> "ScoreFrame":
+        """
+        Rows matching every given filter, in the same order
+        """
+        mask = np.ones(len(self.frame), dtype=bool)
+        if start is not None:
+            mask &= self.frame["created_at"].to_numpy() >= to_timestamp(start)
+        if end is not None:
+            mask &= self.frame["created_at"].to_numpy() <= to_timestamp(end)
+        if chart_ids is not None:
+            mask &= self.frame["chart_id"].isin(chart_ids).to_numpy()
+        if difficulty_names is not None:
+            if isinstance(difficulty_names, str):
+                difficulty_names = [difficulty_names]
+            mask &= self.frame["difficulty_name"].isin(difficulty_names).to_numpy()
+        if cleared_only:
+            mask &= self.frame["cleared"].to_numpy()
+        return self._derive(self.frame[mask])
+
+    def with_column(self, name: str, values: np.ndarray) -> "ScoreFrame":
+        """
+        Copy of this frame with an extra (or replaced) column
+        """
+        return self._derive(self.frame.assign(**{name: values}))
+
+    def first_attempts(self, attempts: int) -> "ScoreFrame":
+        """
+        The first `attempts` rows per entrant and chart, by created_at (ties keep row order)
+        """
+        ordered = self.frame.sort_values("created_at", kind="stable")
+        attempt_number = ordered.groupby(["entrant", "chart_id"], sort=False).cumcount()
+        return self._derive(ordered[attempt_number.to_numpy() < attempts].sort_index())
+
+    def best_per_chart(self) -> "ScoreFrame":
+        """
+        The highest scoring row per entrant and chart (ties keep the earliest row),
+            ordered by where each entrant and chart first appears
+        """
+        first_seen = pd.Series(np.arange(len(self.frame)), index=self.frame.index).groupby(
+            [self.frame["entrant"], self.frame["chart_id"]], sort=False
+        ).transform("min")
+        ordered = self.frame.sort_values("score", ascending=False, kind="stable")
+        best = ordered.drop_duplicates(["entrant", "chart_id"])
+        return self._derive(best.iloc[np.argsort(first_seen[best.index].to_numpy(), kind="stable")])
+
+    def top_k(self, column: str, k: int | None = None) -> "ScoreFrame":
+        """
+        Each entrant's rows sorted by `column`, highest first, keeping the best `k` if given
+        """
+        ordered = self.frame.sort_values(column, ascending=False, kind="stable")
+        if k is not None:
+            ordered = ordered.groupby("entrant", sort=False).head(k)
+        return self._derive(ordered)
+
+    # results
+    def scores_by_entrant(self) -> dict[str, list[Score]]:
+        """
+        Score objects of every entrant's rows, in frame order
+        """
+        return {
+            entrant: [self._scores[row] for row in rows]
+            for entrant, rows in self.frame.groupby("entrant", sort=False)["row"]
+        }
+
+    def column_by_entrant(self, column: str) -> dict[str, list]:
+        """
+        Values of `column` for every entrant's rows, in frame order
+        """
+        return {
+            entrant: values.tolist()
+            for entrant, values in self.frame.groupby("entrant", sort=False)[column]
+        }
+
+    # private helpers
+    def _derive(self, frame: pd.DataFrame) -> "ScoreFrame":
+        return ScoreFrame(frame, self._scores)
@@ -0,0 +1,125 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from src.EligibilityEngine import EligibilityEngine
+from src.Score import Score
+from src.ScoreFetcher import ScoreFetcher, get_score_fetcher
+from src.ScoreStore import to_timestamp
+
+if TYPE_CHECKING:
+    from src.Tournament import Tournament
+
+
+class ScorePool:
+    """
+    Scores shared by every Tournament in one event run
+
+    Each entrant's event window is fetched once, using the union of what every registered
+        Tournament needs, and each Tournament then slices its own scores out of the pool.
+        Pre-event eligibility history is shared the same way, through one EligibilityEngine.
+    """
+    def __init__(self, score_fetcher: ScoreFetcher | None = None):
+        self._score_fetcher = score_fetcher
+        self.tournaments: list["Tournament"] = []
+        # entrant name (casefolded) -> (created_at timestamp, score), sorted by created_at
+        self._scores: dict[str, list[tuple[float, Score]]] | None = None
+        self.eligibility = EligibilityEngine(score_fetcher)
+
+    @property
+    def score_fetcher(self) -> ScoreFetcher:
+        if self._score_fetcher is None:
+            self._score_fetcher = get_score_fetcher()
+        return self._score_fetcher
+
+    def register(self, tournament: "Tournament"):
+        """
+        Add a Tournament whose scores should come from this pool
+
+        Registering after the pool was fetched drops the fetched scores,
+            so the next lookup fetches again with the widened filters
+        """
+        self.tournaments.append(tournament)
+        self._scores = None
+
+    def scores_for(
+        self,
+        entrant_name: str,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+    ) -> list[Score]:
+        """
+        Scores of an entrant created within [start, end], oldest first
+
+        :param entrant_name: Gamer username
+        :type entrant_name: str
+        :param start: Earliest creation time, if any
+        :type start: datetime | str | None
+        :param end: Latest creation time, if any
+        :type end: datetime | str | None
+        """
+        if self._scores is None:
+            self.fetch()
+        start_ts = to_timestamp(start) if start else float("-inf")
+        end_ts = to_timestamp(end) if end else float("inf")
+        return [
+            score for created_at, score in self._scores.get(entrant_name.casefold(), [])
+            if start_ts <= created_at <= end_ts
+        ]
+
+    def signature(self) -> int:
+        """
+        Fingerprint of the pooled scores, which changes whenever a score is added or updated
+        """
+        if self._scores is None:
+            self.fetch()
+        return hash(tuple(
+            (name, score.id, score.updated_at)
+            for name in sorted(self._scores)
+            for _, score in self._scores[name]
+        ))
+
+    def fetch(self):
+        """
+        Fetch every registered entrant's scores once, covering all registered Tournaments
+        """
+        entrant_names = list({
+            entrant.name.casefold(): entrant.name
+            for tournament in self.tournaments
+            for entrant in tournament.entrants
+        }.values())
+        start, end = self._window()
+        difficulty_names = self._difficulty_names()
+
+        searches = [
+            self.score_fetcher.load_stored_entrant_scores(
+                entrant_name=name,
+                start=start,
+                end=end,
+                difficulty_names=difficulty_names,
+                sort_field="created_at",
+                order="asc",
+            )
+            for name in entrant_names
+        ]
+        results = self.score_fetcher.execute_coroutines(searches)
+        self._scores = {
+            name.casefold(): [(to_timestamp(score.created_at), score) for score in result]
+            for name, result in zip(entrant_names, results)
+        }
+
+    # private helpers
+    def _window(self) -> tuple[datetime | str | None, datetime | str | None]:
+        starts = [tournament.start_date for tournament in self.tournaments]
+        ends = [tournament.end_date for tournament in self.tournaments]
+        start = None if None in starts else min(starts, key=to_timestamp, default=None)
+        end = None if None in ends else max(ends, key=to_timestamp, default=None)
+        return start, end
+
+    def _difficulty_names(self) -> list[str] | None:
+        difficulty_names = set()
+        for tournament in self.tournaments:
+            needed = tournament.needed_difficulty_names()
+            if needed is None:  # this tournament needs every difficulty
+                return None
+            difficulty_names.update(needed)
+        return sorted(difficulty_names)
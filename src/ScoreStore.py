@@ -0,0 +1,279 @@
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, UTC
+from pathlib import Path
+
+
+@dataclass(slots=True)
+class GamerSyncState:
+    synced_from: float | None  # timestamp, None when synced from the start of the gamer's history
+    synced_at: str  # datetime, in UTC
+    high_water_mark: str | None = None  # latest updated_at among synced scores, as returned by the API
+    synced_to: float | None = None  # timestamp, None when synced up to the present
+
+    def covers(self, start: float | None, end: float | None) -> bool:
+        """
+        Whether every score created within [start, end] was synced, None being unbounded
+        """
+        return (
+            (self.synced_from is None or (start is not None and start >= self.synced_from))
+            and (self.synced_to is None or (end is not None and end <= self.synced_to))
+        )
+
+
+class ScoreStore:
+    """
+    Persistent local copy of SMX.573.no scores, backed by SQLite
+
+    Kept up to date per gamer by ScoreFetcher, then queried locally so that repeated
+        runs only download scores created or updated since the previous sync
+    """
+    # score fields that can be sorted on, mapped to their column
+    sort_columns = {
+        "id": "id",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+        "score": "score",
+        "song_chart_id": "chart_id",
+    }
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._create_tables()
+
+    def close(self):
+        self._connection.close()
+
+    # sync bookkeeping
+    def get_sync_state(self, gamer: str, query: str = "") -> GamerSyncState | None:
+        """
+        Sync state of a gamer, for one query fingerprint ("" for the gamer's full score history)
+        """
+        row = self._connection.execute(
+            "SELECT synced_from, synced_to, synced_at, high_water_mark FROM sync_state WHERE gamer = ? AND query = ?",
+            (gamer.casefold(), query),
+        ).fetchone()
+        if row is None:
+            return None
+        return GamerSyncState(synced_from=row[0], synced_to=row[1], synced_at=row[2], high_water_mark=row[3])
+
+    def set_sync_state(self, gamer: str, state: GamerSyncState, query: str = ""):
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_state (gamer, query, synced_from, synced_to, synced_at, high_water_mark) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (gamer.casefold(), query, state.synced_from, state.synced_to, state.synced_at, state.high_water_mark),
+            )
+
+    # data access
+    def upsert_scores(self, raw_scores: list[dict]) -> int:
+        """
+        Insert or replace raw API score rows, keyed by score id
+
+        Nested chart and song objects are not stored, they are rejoined from the catalog on read
+
+        :param raw_scores: Score rows as returned by the /scores endpoint
+        :type raw_scores: list[dict]
+        :return: Number of rows written
+        :rtype: int
+        """
+        rows = []
+        for raw_score in raw_scores:
+            chart = raw_score["chart"]
+            data = {
+                key: value for key, value in raw_score.items()
+                if key not in ("chart", "song")
+            }
+            rows.append((
+                raw_score["id"],
+                raw_score["gamer"]["username"].casefold(),
+                chart["id"],
+                chart["song_id"],
+                chart["difficulty"],
+                chart["difficulty_name"],
+                to_timestamp(raw_score["created_at"]),
+                to_timestamp(raw_score["updated_at"]),
+                raw_score["score"],
+                raw_score["cleared"],
+                json.dumps(data),
+            ))
+        with self._connection:
+            self._connection.executemany(
+                """
+                INSERT OR REPLACE INTO scores (
+                    id, gamer, chart_id, song_id, difficulty, difficulty_name,
+                    created_at, updated_at, score, cleared, data
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def query_scores(
+        self,
+        *,
+        gamer: str,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+        score_gte: int | None = None,
+        score_lte: int | None = None,
+        difficulty: list[int] | None = None,
+        difficulty_names: str | list[str] | None = None,
+        chart_ids: list[int] | None = None,
+        sort_field: str | None = None,
+        order: str | None = None,
+        get_cleared_only: bool = False,
+        get_max_only: bool = False,
+        take: int | None = None,
+    ) -> list[tuple[int, int, dict]]:
+        """
+        Local equivalent of a /scores query, mirroring ScoreFetcher.load_entrant_scores filters
+
+        :return: (chart id, song id, raw score without chart/song) for each matching score
+        :rtype: list[tuple[int, int, dict]]
+        """
+        clauses = ["gamer = ?"]
+        values: list = [gamer.casefold()]
+        if start:
+            clauses.append("created_at >= ?")
+            values.append(to_timestamp(start))
+        if end:
+            clauses.append("created_at <= ?")
+            values.append(to_timestamp(end))
+        if score_gte:
+            clauses.append("score >= ?")
+            values.append(score_gte)
+        if score_lte:
+            clauses.append("score <= ?")
+            values.append(score_lte)
+        if get_cleared_only:
+            clauses.append("cleared = 1")
+        for column, allowed in (
+            ("difficulty", difficulty),
+            ("difficulty_name", difficulty_names),
+            ("chart_id", chart_ids),
+        ):
+            if allowed is None:
+                continue
+            if not isinstance(allowed, list):
+                allowed = [allowed]
+            clauses.append(f"{column} IN ({', '.join('?' * len(allowed))})")
+            values.extend(allowed)
+
+        columns = "chart_id, song_id, data"
+        group_by = ""
+        if get_max_only:
+            # with GROUP BY, SQLite takes the bare columns from the row holding MAX(score)
+            columns += ", MAX(score)"
+            group_by = " GROUP BY chart_id"
+        query = f"SELECT {columns} FROM scores WHERE {' AND '.join(clauses)}{group_by}"
+
+        if sort_field is not None and sort_field not in self.sort_columns:
+            raise ValueError(f"Unsupported sort field for local score query: {sort_field}")
+        if order is not None and order.casefold() not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort order for local score query: {order}")
+        query += f" ORDER BY {self.sort_columns[sort_field or 'id']} {(order or 'asc').upper()}, id ASC"
+        if take is not None:
+            query += " LIMIT ?"
+            values.append(take)
+
+        return [
+            (row[0], row[1], json.loads(row[2]))
+            for row in self._connection.execute(query, values)
+        ]
+
+    # play volume, for planning queries
+    def count_scores_per_chart(
+        self,
+        *,
+        gamer: str,
+        chart_ids: list[int],
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+    ) -> dict[int, int]:
+        """
+        Number of stored scores of a gamer on each of `chart_ids` created within [start, end]
+        """
+        clauses = ["gamer = ?", f"chart_id IN ({', '.join('?' * len(chart_ids))})"]
+        values: list = [gamer.casefold(), *chart_ids]
+        if start:
+            clauses.append("created_at >= ?")
+            values.append(to_timestamp(start))
+        if end:
+            clauses.append("created_at <= ?")
+            values.append(to_timestamp(end))
+        counts = dict(self._connection.execute(
+            f"SELECT chart_id, COUNT(*) FROM scores WHERE {' AND '.join(clauses)} GROUP BY chart_id",
+            values,
+        ).fetchall())
+        return {chart_id: counts.get(chart_id, 0) for chart_id in chart_ids}
+
+    def play_rate(self, gamer: str) -> float | None:
+        """
+        Average stored scores per day of a gamer, over the span of their stored scores
+
+        :return: Scores per day, None without at least two stored scores
+        :rtype: float | None
+        """
+        count, first, last = self._connection.execute(
+            "SELECT COUNT(*), MIN(created_at), MAX(created_at) FROM scores WHERE gamer = ?",
+            (gamer.casefold(),),
+        ).fetchone()
+        if count < 2:
+            return None
+        return count / max((last - first) / 86400, 1.0)
+
+    # private helpers
+    def _create_tables(self):
+        with self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS scores (
+                    id INTEGER PRIMARY KEY,
+                    gamer TEXT NOT NULL,  -- casefolded username
+                    chart_id INTEGER NOT NULL,
+                    song_id INTEGER NOT NULL,
+                    difficulty INTEGER NOT NULL,
+                    difficulty_name TEXT NOT NULL,
+                    created_at REAL NOT NULL,  -- timestamp
+                    updated_at REAL NOT NULL,  -- timestamp
+                    score INTEGER NOT NULL,
+                    cleared INTEGER NOT NULL,
+                    data TEXT NOT NULL  -- raw score json, minus chart and song
+                );
+                CREATE INDEX IF NOT EXISTS scores_by_gamer_chart
+                    ON scores (gamer, chart_id, created_at);
+                CREATE INDEX IF NOT EXISTS scores_by_gamer_created_at
+                    ON scores (gamer, created_at);
+                CREATE INDEX IF NOT EXISTS scores_by_gamer_score
+                    ON scores (gamer, score);
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    gamer TEXT NOT NULL,  -- casefolded username
+                    query TEXT NOT NULL,  -- query fingerprint, "" for the full score history
+                    synced_from REAL,
+                    synced_to REAL,
+                    synced_at TEXT NOT NULL,
+                    high_water_mark TEXT,
+                    PRIMARY KEY (gamer, query)
+                );
+                """
+            )
+
+
+def to_timestamp(value: datetime | date | str) -> float:
+    """
+    Convert an API or config datetime into a POSIX timestamp, treating naive values as UTC
+
+    :param value: datetime, date, or ISO 8601 string
+    :type value: datetime | date | str
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):  # plain date
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
@@ -1,37 +1,88 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, TYPE_CHECKING
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from src.AttemptPlanner import AttemptPlanner
+from src.assignment import assign_charts
 from src.Chart import Chart
 from src.Entrant import Entrant
+from src.LadderStandings import LadderStandings
 from src.Song import Song
-from src.ScoreFetcher import ScoreFetcher
+from src.ScoreFetcher import ScoreFetcher, get_score_fetcher
+from src.ScorePool import ScorePool
+from src.ScoreStore import to_timestamp
+from src.Score import Score
 from src.Eligibility import EligibilityConfig, Eligibility
+from src.EligibilityEngine import EligibilityEngine
+from src.ReportWriter import ConditionalFormat, Grid, ReportWriter
 from src.helpers import load_config_file
 
-from gspread.spreadsheet import Spreadsheet
-from gspread.worksheet import Worksheet
-from gspread.cell import Cell
-import gspread_formatting as gsf
+# gspread and gspread_formatting are only imported on the reporting paths that use them
+if TYPE_CHECKING:
+    from gspread.spreadsheet import Spreadsheet
+    from gspread.worksheet import Worksheet
+    import numpy as np
+    import pandas as pd
+
+    from src.ScoreFrame import ScoreFrame
 
-sf = ScoreFetcher()
-sf.debug = False
 
 class Tournament(ABC):
     def __init__(
         self,
         name: str,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        score_fetcher: ScoreFetcher | None = None,
+        score_pool: ScorePool | None = None,
     ):
         self.name = name
         self.start_date = start_date
         self.end_date = end_date
-        self.charts: list[Chart] = sf.charts
-        self.songs: list[Song] = sf.songs
+        self._score_fetcher = score_fetcher
+        self._charts: list[Chart] | None = None
+        self._songs: list[Song] | None = None
         
         self.entrants: list[Entrant] = []
+
+        # scores shared with the other tournaments of the event, if any
+        self.score_pool = score_pool
+        if score_pool is not None:
+            score_pool.register(self)
+
+    @property
+    def score_fetcher(self) -> ScoreFetcher:
+        """
+        ScoreFetcher used for all API calls, falling back to the shared default on first use
+        """
+        if self._score_fetcher is None:
+            if self.score_pool is not None:
+                self._score_fetcher = self.score_pool.score_fetcher
+            else:
+                self._score_fetcher = get_score_fetcher()
+        return self._score_fetcher
+
+    @property
+    def charts(self) -> list[Chart]:
+        if self._charts is None:
+            return self.score_fetcher.charts
+        return self._charts
+
+    @charts.setter
+    def charts(self, charts: list[Chart]):
+        self._charts = charts
+
+    @property
+    def songs(self) -> list[Song]:
+        if self._songs is None:
+            return self.score_fetcher.songs
+        return self._songs
+
+    @songs.setter
+    def songs(self, songs: list[Song]):
+        self._songs = songs
     
     def load_entrants(self, entrant_names: list[str]):
         """
@@ -45,9 +96,17 @@ class Tournament(ABC):
             for name in entrant_names
         ]
 
-    def run(self, result_spreadsheet: Spreadsheet):
+    def needed_difficulty_names(self) -> list[str] | None:
+        """
+        Difficulty names this Tournament can use scores from, None for any
+
+        Lets a ScorePool narrow its shared fetch
+        """
+        return None
+
+    def run(self, result_spreadsheet: "Spreadsheet", report_writer: ReportWriter | None = None):
         self.get_all_scores()
-        self.report_results(result_spreadsheet)
+        self.report_results(result_spreadsheet, report_writer)
 
     @abstractmethod
     def get_all_scores(self):
@@ -57,8 +116,7 @@ class Tournament(ABC):
         # must be implemented by each tournament
         pass
 
-    @abstractmethod
-    def report_results(self, spreadsheet: Spreadsheet):
+    def report_results(self, spreadsheet: "Spreadsheet", report_writer: ReportWriter | None = None):
         """
         Report all tournament results in the target spreadsheet.
 
@@ -66,11 +124,35 @@ class Tournament(ABC):
         
         :param spreadsheet: Spreadsheet to send results
         :type spreadsheet: Spreadsheet
+        :param report_writer: Writer to stage results on, flushed by the caller.
+            If None, results are sent right away.
+        :type report_writer: ReportWriter | None
+        """
+        writer = report_writer if report_writer is not None else ReportWriter()
+        self.stage_results(writer)
+        if report_writer is None:
+            writer.flush(spreadsheet)
+
+    @abstractmethod
+    def stage_results(self, report_writer: ReportWriter):
+        """
+        Render all tournament results and stage them on the writer, one grid per worksheet
+
+        :param report_writer: Writer to stage results on
+        :type report_writer: ReportWriter
         """
         # must be implemented by each tournament
         pass
 
 class LadderTournament(Tournament):
+    # ladder point formula settings, as named in config files
+    formula_parameters = (
+        "scoring_floor",
+        "ladder_point_exponent",
+        "ladder_point_divisor",
+        "num_scores_to_count",
+    )
+
     def __init__(
         self,
         name: str,
@@ -84,6 +166,8 @@ class LadderTournament(Tournament):
         score_details_sheet_name: str | None = None,
         restrict_to_difficulties: str | list[str] | None = None,
         cleared_only: bool | None = None,
+        score_fetcher: ScoreFetcher | None = None,
+        score_pool: ScorePool | None = None,
     ):
         self.scoring_floor = scoring_floor if scoring_floor else 0
         self.ladder_point_exponent = ladder_point_exponent if ladder_point_exponent else 2.0
@@ -97,11 +181,16 @@ class LadderTournament(Tournament):
         )
         self.restrict_to_difficulties = restrict_to_difficulties  # default value of None is fine
         self.cleared_only = cleared_only if cleared_only else False
+        self.score_frame: "ScoreFrame | None" = None  # best score per chart, ranked by ladder points
+        self.standings: LadderStandings | None = None
+        self._counted_versions: dict[int, str] = {}  # score id -> updated_at, of scores in the standings
         
         super().__init__(
             name=name,
             start_date=start_date,
             end_date=end_date,
+            score_fetcher=score_fetcher,
+            score_pool=score_pool,
         )
 
     @classmethod
@@ -109,6 +198,8 @@ class LadderTournament(Tournament):
         cls,
         config_filepath: Path,
         entrant_filepath: Path,
+        score_fetcher: ScoreFetcher | None = None,
+        score_pool: ScorePool | None = None,
     ) -> "LadderTournament":
         """
         Create a LadderTournament from config files, and loads entrants
@@ -117,6 +208,10 @@ class LadderTournament(Tournament):
         :type config_filepath: Path
         :param entrant_filepath: Path to entrant list (as .json or .yaml)
         :type entrant_filepath: Path
+        :param score_fetcher: ScoreFetcher to use, defaults to the shared one
+        :type score_fetcher: ScoreFetcher | None
+        :param score_pool: ScorePool shared with the other tournaments of the event, if any
+        :type score_pool: ScorePool | None
         :return: Configured LadderTournament, ready to run
         :rtype: LadderTournament
         """
@@ -133,6 +228,8 @@ class LadderTournament(Tournament):
             score_details_sheet_name=config.get("score_details_sheet_name"),
             restrict_to_difficulties=config.get("restrict_to_difficulties"),
             cleared_only=config.get("cleared_only"),
+            score_fetcher=score_fetcher,
+            score_pool=score_pool,
         )
         entrants: list[str] = load_config_file(entrant_filepath)
         tournament.load_entrants(entrants)
@@ -144,150 +241,265 @@ class LadderTournament(Tournament):
         For each entrant, retrieves the best score on each chart played during the Tournament.
 
         Filtering is controlled by LadderTournament configuration.
+
+        Once standings exist, scores from a ScorePool are applied incrementally,
+            only counting scores that are new or updated since the previous call.
         """
-        searches = []
-        for entrant in self.entrants:
-            searches.append(sf.load_entrant_scores(
-                entrant_name=entrant.name,
-                start=self.start_date,
-                end=self.end_date,
-                difficulty_names=self.restrict_to_difficulties,
-                get_cleared_only=self.cleared_only,
-                get_max_only=True,
-            ))
-        results = sf.execute_coroutines(searches)
-        for index in range(len(self.entrants)):
-            entrant = self.entrants[index]
-            entrant.set_scores(results[index])
-        self._order_scores_by_ladder_points()
-
-    def report_results(
-        self,
-        spreadsheet: Spreadsheet,
-    ):
-        overall_sheet = spreadsheet.worksheet(self.overall_results_sheet_name)
-        self._report_overall_results(overall_sheet)
-        detail_sheet = spreadsheet.worksheet(self.score_details_sheet_name)
-        self._report_score_details(detail_sheet)
+        if self.standings is not None and self.score_pool is not None:
+            self._add_new_scores()
+            return
+        self._compute_standings()
+
+    def needed_difficulty_names(self) -> list[str] | None:
+        if isinstance(self.restrict_to_difficulties, str):
+            return [self.restrict_to_difficulties]
+        return self.restrict_to_difficulties
+
+    def stage_results(self, report_writer: ReportWriter):
+        report_writer.stage(
+            self.overall_results_sheet_name,
+            self._render_overall_results(),
+            frozen_rows=1,
+        )
+        report_writer.stage(
+            self.score_details_sheet_name,
+            self._render_score_details(),
+            frozen_rows=1,
+        )
+
+    # Additional public methods
+    def add_scores(self, scores: list[Score]) -> set[str]:
+        """
+        Apply new scores to the standings, without recomputing anything else
+
+        Scores outside the Tournament window or filters are ignored
+
+        :param scores: New or updated scores, of any entrant
+        :type scores: list[Score]
+        :return: Names of the entrants whose best scores changed
+        :rtype: set[str]
+        """
+        if self.standings is None:
+            self._compute_standings()
+        entrant_names = {entrant.name.casefold(): entrant.name for entrant in self.entrants}
+        difficulty_names = self.needed_difficulty_names()
+        start, end = to_timestamp(self.start_date), to_timestamp(self.end_date)
+        changed = set()
+        for score in scores:
+            entrant_name = entrant_names.get(score.gamer.username.casefold())
+            self._counted_versions[score.id] = score.updated_at
+            if entrant_name is None or not start <= to_timestamp(score.created_at) <= end:
+                continue
+            if difficulty_names is not None and score.chart.difficulty_name not in difficulty_names:
+                continue
+            if self.cleared_only and not score.cleared:
+                continue
+            points = score.ladder_points(
+                score_floor=self.scoring_floor,
+                difficulty_scaling=self.ladder_point_exponent,
+                divisor=self.ladder_point_divisor,
+            )
+            if self.standings.add(entrant_name, score, points):
+                changed.add(entrant_name)
+        if changed:
+            self.score_frame = None  # no longer matches the standings, rebuilt when needed
+            for entrant in self.entrants:
+                if entrant.name in changed:
+                    entrant.set_scores([score for score, _ in self.standings.scores(entrant.name)])
+        return changed
+
+    def sweep_formula(self, parameter_grid: dict[str, list]) -> "pd.DataFrame":
+        """
+        Standings under every combination of ladder formula settings, in one vectorized pass
+
+        Reuses the scores already fetched for the Tournament, so no extra API requests are made.
+            Ladder points for every combination are computed at once over an entrant x chart
+            matrix of best scores, and each entrant's counted scores are picked by partial
+            selection rather than a full sort.
+
+        :param parameter_grid: Values to try per formula setting (see `formula_parameters`),
+            settings left out keep the Tournament's configured value
+        :type parameter_grid: dict[str, list]
+        :return: One row per combination and entrant, with the settings, "entrant",
+            "total" and "rank" (ties ordered like the Overall Results sheet)
+        :rtype: pd.DataFrame
+        :raises ValueError: If the grid names an unknown setting
+        """
+        import itertools
+        import numpy as np
+        import pandas as pd
+
+        unknown = set(parameter_grid) - set(self.formula_parameters)
+        if unknown:
+            raise ValueError(f"Unknown ladder formula settings: {sorted(unknown)}")
+        if self.score_frame is None:
+            self._compute_standings()
+
+        combinations = list(itertools.product(*[
+            parameter_grid.get(name, [getattr(self, name)])
+            for name in self.formula_parameters
+        ]))
+        floors, exponents, divisors, counts = np.array(combinations, dtype=np.float64).T
+        counts = counts.astype(np.int64)
+
+        # entrant x chart matrices of best scores, unused slots are masked out
+        names = [entrant.name for entrant in self.entrants]
+        frame = self.score_frame.frame
+        entrant_index = pd.Categorical(frame["entrant"], categories=names).codes
+        slot = frame.groupby("entrant", sort=False).cumcount().to_numpy()
+        width = max(int(slot.max()) + 1 if len(slot) else 0, int(counts.max()), 1)
+        scores = np.zeros((len(names), width))
+        difficulties = np.zeros((len(names), width))
+        filled = np.zeros((len(names), width), dtype=bool)
+        scores[entrant_index, slot] = frame["score"].to_numpy()
+        difficulties[entrant_index, slot] = frame["difficulty"].to_numpy()
+        filled[entrant_index, slot] = True
+
+        totals = np.zeros((len(combinations), len(names)))
+        chunk = max(1, 2 ** 22 // max(scores.size, 1))  # combinations per pass, bounds memory use
+        for begin in range(0, len(combinations), chunk):
+            part = slice(begin, begin + chunk)
+            points = (
+                (scores - floors[part, None, None])
+                * difficulties ** exponents[part, None, None]
+                / divisors[part, None, None]
+            )
+            points = np.where(filled, np.maximum(points, 0), 0)
+            for count in np.unique(counts[part]):
+                if count <= 0:
+                    continue
+                selected = np.flatnonzero(counts[part] == count)
+                best = -np.partition(-points[selected], count - 1, axis=-1)[..., :count]
+                # rounding is monotonic, so only the counted points need python's round, like the sheet
+                rounded = np.array([round(value, 2) for value in best.ravel().tolist()]).reshape(best.shape)
+                totals[begin + selected] = rounded.sum(axis=-1)
+
+        # rank entrants per combination, ties keep entrant order like _calculate_overall_results
+        order = np.argsort(-totals, axis=1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(1, len(names) + 1)[None, :], axis=1)
+
+        sweep = pd.DataFrame(
+            [combination for combination in combinations for _ in names],
+            columns=list(self.formula_parameters),
+        )
+        sweep["entrant"] = names * len(combinations)
+        sweep["total"] = totals.ravel()
+        sweep["rank"] = ranks.ravel()
+        return sweep
 
     # Private helpers
-    def _order_scores_by_ladder_points(self):
+    def _ladder_points(self, frame: "ScoreFrame") -> "np.ndarray":
+        """
+        Vectorized Score.ladder_points, for every row of `frame`
+        """
+        import numpy as np
+
+        score = frame.frame["score"].to_numpy()
+        difficulty = frame.frame["difficulty"].to_numpy().astype(np.float64)
+        return np.maximum(
+            (score - self.scoring_floor) * (difficulty ** self.ladder_point_exponent) / self.ladder_point_divisor,
+            0,
+        )
+
+    def _compute_standings(self):
+        """
+        Fetch every entrant's best score per chart, and rank them from scratch
+        """
+        from src.ScoreFrame import ScoreFrame
+
+        if self.score_pool is not None:
+            frame = ScoreFrame.from_scores({
+                entrant.name: self.score_pool.scores_for(entrant.name, self.start_date, self.end_date)
+                for entrant in self.entrants
+            })
+            frame = frame.filter(
+                difficulty_names=self.restrict_to_difficulties,
+                cleared_only=self.cleared_only,
+            ).best_per_chart()
+        else:
+            searches = []
+            for entrant in self.entrants:
+                searches.append(self.score_fetcher.load_stored_entrant_scores(
+                    entrant_name=entrant.name,
+                    start=self.start_date,
+                    end=self.end_date,
+                    difficulty_names=self.restrict_to_difficulties,
+                    get_cleared_only=self.cleared_only,
+                    get_max_only=True,
+                ))
+            results = self.score_fetcher.execute_coroutines(searches)
+            frame = ScoreFrame.from_scores({
+                entrant.name: result
+                for entrant, result in zip(self.entrants, results)
+            })
+        self.score_frame = frame.with_column("ladder_points", self._ladder_points(frame)).top_k("ladder_points")
+        scores = self.score_frame.scores_by_entrant()
         for entrant in self.entrants:
-            sorted_scores = sorted(
-                entrant.scores,
-                key=lambda x: x.ladder_points(
-                    score_floor=self.scoring_floor,
-                    difficulty_scaling=self.ladder_point_exponent,
-                    divisor=self.ladder_point_divisor,
-                ),
-                reverse=True,
-            )
-            entrant.set_scores(sorted_scores)
-    
-    def _report_overall_results(self, worksheet: Worksheet):
-        start_row = 1
-        current_row = self._write_overall_header_to_worksheet(worksheet, start_row)
-        current_row = self._write_overall_data_to_worksheet(worksheet, current_row)
-        self._format_overall_data_worksheet(worksheet)
-    
-    def _write_overall_header_to_worksheet(self, worksheet: Worksheet, row):
-        cells = [
-            Cell(row, 1, "Rank"),
-            Cell(row, 2, "Player Name"),
-            Cell(row, 3, "Ladder Point Total")
+            entrant.set_scores(scores.get(entrant.name, []))
+
+        ladder_points = self.score_frame.column_by_entrant("ladder_points")
+        self.standings = LadderStandings([entrant.name for entrant in self.entrants], self.num_scores_to_count)
+        for entrant in self.entrants:
+            for score, points in zip(scores.get(entrant.name, []), ladder_points.get(entrant.name, [])):
+                self.standings.add(entrant.name, score, points)
+        # scores seen so far, best per chart or not, so later calls only apply what is new
+        if self.score_pool is not None:
+            self._counted_versions = {
+                score.id: score.updated_at
+                for entrant in self.entrants
+                for score in self.score_pool.scores_for(entrant.name, self.start_date, self.end_date)
+            }
+
+    def _add_new_scores(self):
+        """
+        Apply scores from the ScorePool that the standings have not seen yet
+        """
+        new_scores = [
+            score
+            for entrant in self.entrants
+            for score in self.score_pool.scores_for(entrant.name, self.start_date, self.end_date)
+            if self._counted_versions.get(score.id) != score.updated_at
         ]
-        worksheet.update_cells(cells)
-        return row + 1
-    
-    def _write_overall_data_to_worksheet(self, worksheet: Worksheet, row):
-        overall_results = self._calculate_overall_results()
-        cells = []
+        self.add_scores(new_scores)
+
+    def _render_overall_results(self) -> Grid:
+        grid: Grid = [["Rank", "Player Name", "Ladder Point Total"]]
         rank = 1
-        for elem in overall_results:
-            col = 1
-            cells.append(Cell(row, col, str(rank)))
-            col += 1
-            cells.append(Cell(row, col, elem[1].name))
-            col += 1
-            cells.append(Cell(row, col, str(elem[0])))
-            row += 1
+        for elem in self._calculate_overall_results():
+            grid.append([str(rank), elem[1].name, str(elem[0])])
             rank += 1
-        if cells:
-            worksheet.update_cells(cells)
-        return row
-    
-    def _format_overall_data_worksheet(self, worksheet: Worksheet):
-        gsf.set_frozen(worksheet, rows=1)
-        # Add additional formatting as necessary
+        return grid
 
     def _calculate_overall_results(self) -> list[tuple[float, Entrant]]:
-        overall_results = []
-        for entrant in self.entrants:
-            total_ladder_points = 0
-            for score in entrant.scores[ : self.num_scores_to_count]:
-                total_ladder_points += round(score.ladder_points(
-                    score_floor=self.scoring_floor,
-                    difficulty_scaling=self.ladder_point_exponent,
-                    divisor=self.ladder_point_divisor
-                ), 2)
-            overall_results.append((total_ladder_points, entrant))
-        overall_results = sorted(
-            overall_results,
-            key=lambda x: x[0],
-            reverse=True
-        )
-        return overall_results
-
-    def _report_score_details(self, worksheet: Worksheet):
-        start_row = 1
-        current_row = self._write_detail_header_to_worksheet(worksheet, start_row)
-        current_row = self._write_detail_data_to_worksheet(worksheet, current_row)
-        self._format_detail_data_worksheet(worksheet)
-        # self._apply_filter_to_detail_worksheet(worksheet)  # TODO: Fix this!!
-
-    def _write_detail_header_to_worksheet(self, worksheet: Worksheet, row):
-        cells = [
-            Cell(row, 1, "Player Name"),
-            Cell(row, 2, "Song"),
-            Cell(row, 3, "Difficulty Name"),
-            Cell(row, 4, "Difficulty Value"),
-            Cell(row, 5, "Score"),
-            Cell(row, 6, "Ladder Points"),
+        entrants = {entrant.name: entrant for entrant in self.entrants}
+        return [
+            (total, entrants[entrant_name])
+            for total, entrant_name in self.standings.ranking()
         ]
-        worksheet.update_cells(cells)
-        return row + 1
-    
-    def _write_detail_data_to_worksheet(self, worksheet: Worksheet, row):
-        cells = []
+
+    def _render_score_details(self) -> Grid:
+        grid: Grid = [[
+            "Player Name",
+            "Song",
+            "Difficulty Name",
+            "Difficulty Value",
+            "Score",
+            "Ladder Points",
+        ]]
         for entrant in self.entrants:
-            for score in entrant.scores[ : self.num_scores_to_count]:
-                col = 1
-                cells.append(Cell(row, col, entrant.name))
-                col += 1
-                ladder_points = round(score.ladder_points(
-                    score_floor=self.scoring_floor,
-                    difficulty_scaling=self.ladder_point_exponent,
-                    divisor=self.ladder_point_divisor,
-                ), 2)
-                cells.append(Cell(row, col, score.song.title))
-                col += 1
-                cells.append(Cell(row, col, score.chart.difficulty_display))
-                col += 1
-                cells.append(Cell(row, col, str(score.chart.difficulty)))
-                col += 1
-                cells.append(Cell(row, col, str(score.score)))
-                col += 1
-                cells.append(Cell(row, col, str(ladder_points)))
-                row += 1
-        if cells:
-            worksheet.update_cells(cells)
-        return row
-
-    def _format_detail_data_worksheet(self, worksheet: Worksheet):
-        gsf.set_frozen(worksheet, rows=1)
-        # Add additional formatting as necessary
-
-    def _apply_filter_to_detail_worksheet(self, worksheet: Worksheet):
+            for score, points in self.standings.scores(entrant.name, self.num_scores_to_count):
+                grid.append([
+                    entrant.name,
+                    score.song.title,
+                    score.chart.difficulty_display,
+                    str(score.chart.difficulty),
+                    str(score.score),
+                    str(round(points, 2)),
+                ])
+        return grid
+
+    def _apply_filter_to_detail_worksheet(self, worksheet: "Worksheet"):
         # NOT ACTUALLY IMPLEMENTED!!!
         # TODO: Figure this ish out
         request = {
@@ -319,8 +531,6 @@ class LadderTournament(Tournament):
 
 
 class GauntletTournament(Tournament):
-    max_difficulty = 26
-
     def __init__(
         self,
         name: str,
@@ -328,20 +538,38 @@ class GauntletTournament(Tournament):
         end_date: datetime,
         attempts_to_count: int,
         ineligible_requirements: list[EligibilityConfig] | None = None,
+        ranked_charts: int | None = None,
+        rank_point_curve: list[float] | None = None,
+        rank_point_ties: str = "shared",
+        score_fetcher: ScoreFetcher | None = None,
+        score_pool: ScorePool | None = None,
     ):
         super().__init__(
             name=name,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            score_fetcher=score_fetcher,
+            score_pool=score_pool,
         )
         self.attempts_to_count = attempts_to_count
         self.ineligible_requirements = ineligible_requirements
+        self.ranked_charts = ranked_charts  # rank points only count the first this many charts, if set
+        # polynomial over relative placement, highest power first, defaults to score_calc's curve
+        self.rank_point_curve = rank_point_curve
+        self.rank_point_ties = rank_point_ties  # see src.rank_points.placements
+        # eligibility history is shared with the other tournaments of the event, if any
+        if score_pool is not None:
+            self.eligibility_engine = score_pool.eligibility
+        else:
+            self.eligibility_engine = EligibilityEngine(score_fetcher)
 
     @classmethod
     def from_config_file(
         cls,
         config_filepath: Path,
         entrant_filepath: Path,
+        score_fetcher: ScoreFetcher | None = None,
+        score_pool: ScorePool | None = None,
     ) -> "GauntletTournament":
         # Load base config
         base_dict: dict = load_config_file(config_filepath)
@@ -349,6 +577,8 @@ class GauntletTournament(Tournament):
         
         # build eligibility details
         disqualify_if = config.get("disqualify_if")
+        if isinstance(disqualify_if, dict):  # a single requirement
+            disqualify_if = [disqualify_if] if disqualify_if else None
         if disqualify_if:
             eligibility_config = [
                 EligibilityConfig(
@@ -361,12 +591,17 @@ class GauntletTournament(Tournament):
         else:
             eligibility_config = None
 
-        tournament = GauntletTournament(
+        tournament = cls(
             name=config.get("name", "unknown tournament"),
             start_date=datetime.fromisoformat(str(config["start_date"])),
             end_date=datetime.fromisoformat(str(config["end_date"])),
             attempts_to_count=config["attempts_to_count"],
             ineligible_requirements=eligibility_config,
+            ranked_charts=config.get("ranked_charts"),
+            rank_point_curve=config.get("rank_point_curve"),
+            rank_point_ties=config.get("rank_point_ties", "shared"),
+            score_fetcher=score_fetcher,
+            score_pool=score_pool,
         )
 
         # do chart and entrant initialization
@@ -380,86 +615,76 @@ class GauntletTournament(Tournament):
     def chart_ids(self):
         return [chart.id for chart in self.charts]
 
+    @property
+    def counted_attempts(self) -> int:
+        """
+        Attempts counted per chart, which past events have scored as `attempts_to_count` + 1
+        """
+        return self.attempts_to_count + 1
+
     # Implement abstract methods
     def load_entrants(self, entrant_names):
-        print(f"loading entrants for tournament {self.name}")
-        if not self.ineligible_requirements:  # shortcircuit if we don't need to check eligibility
-            super().load_entrants(entrant_names=entrant_names)
-            return
+        """
+        Loads all entrants, queueing their eligibility checks with the EligibilityEngine
 
-        searches = []
-        name_to_result_map = {
-            name: []
-            for name in entrant_names
-        }
-        result_index = 0
-        for name in entrant_names:
-            for requirement in self.ineligible_requirements:
-                searches.append(sf.load_entrant_scores(
-                    entrant_name=name,
-                    difficulty=list(range(requirement.difficulty, self.max_difficulty)),
-                    score_gte=requirement.score,
-                    end=self.start_date,  # only disqualify based on scores beforehand
-                    get_max_only=True,
-                    take=requirement.count,
-                ))
-                name_to_result_map[name].append({"index": result_index, "requirement": requirement})
-                result_index += 1
-        results = sf.execute_coroutines(searches)
-        for name, result_info in name_to_result_map.items():
-            player_eligibilities = []
-            element: dict
-            for element in result_info:
-                index: int = element["index"]
-                requirement: EligibilityConfig = element["requirement"]
-                player_eligibilities.append(
-                    Eligibility(
-                        eligible=not len(results[index]) >= requirement.count,
-                        difficulty=requirement.difficulty,
-                        score=str(requirement.score) + "+",
-                        count=requirement.count,
-                    )
-                )
-            self.entrants.append(
-                Entrant(
-                    name=name,
-                    eligibilities=player_eligibilities,
-                )
+        Eligibilities are filled in by resolve_eligibility, which fetches once for every
+            Tournament sharing the engine
+        """
+        print(f"loading entrants for tournament {self.name}")
+        super().load_entrants(entrant_names=entrant_names)
+        if self.ineligible_requirements:
+            self.eligibility_engine.register(
+                entrants=self.entrants,
+                before=self.start_date,
+                requirements=self.ineligible_requirements,
             )
 
+    def resolve_eligibility(self):
+        """
+        Make sure every entrant's eligibility has been evaluated
+        """
+        self.eligibility_engine.resolve()
+
     def get_all_scores(self) -> None:
         """
-        Best score submitted within the first `attempts_to_count` attempts
+        Best score submitted within the first `counted_attempts` attempts
             for each chart in the Tournament
         """
-        searches = []
+        from src.ScoreFrame import ScoreFrame
+
+        self.resolve_eligibility()
+        if self.score_pool is not None:
+            results = [
+                self.score_pool.scores_for(entrant.name, self.start_date, self.end_date)
+                for entrant in self.entrants
+            ]
+        else:
+            # per entrant, either one broad query or capped per chart queries, whichever is cheaper
+            attempt_planner = AttemptPlanner(self.score_fetcher)
+            searches = []
+            for entrant in self.entrants:
+                searches.append(
+                    attempt_planner.load_first_attempts(
+                    entrant_name=entrant.name,
+                    chart_ids=self.chart_ids,
+                    attempts=self.counted_attempts,
+                    start=self.start_date,
+                    end=self.end_date,
+                ))
+            results = self.score_fetcher.execute_coroutines(searches)
+        frame = ScoreFrame.from_scores({
+            entrant.name: result
+            for entrant, result in zip(self.entrants, results)
+        })
+        frame = frame.filter(chart_ids=self.chart_ids)
+        scores = frame.first_attempts(self.counted_attempts).best_per_chart().scores_by_entrant()
         for entrant in self.entrants:
-            searches.append(
-                sf.load_entrant_scores(
-                entrant_name=entrant.name,
-                chart_ids=self.chart_ids,
-                start=self.start_date,
-                end=self.end_date,
-                sort_field="created_at",
-                order="asc"
-            ))
-        results = sf.execute_coroutines(searches)
-        for index in range(len(self.entrants)):
-            entrant = self.entrants[index]
-            result = results[index]
-                
-            score_counter = {
-                chart_id: 0
-                for chart_id in self.chart_ids
-            }
-            for score in result:
-                chart_id = score.song_chart_id
-                if score_counter[chart_id] <= self.attempts_to_count:
-                    entrant.scores.append(score)
-                    score_counter[chart_id] += 1
-            entrant.maximize_scores()
+            entrant.set_scores(scores.get(entrant.name, []))
+
+    def needed_difficulty_names(self) -> list[str] | None:
+        return sorted({chart.difficulty_name for chart in self.charts})
 
-    def report_results(self, spreadsheet: Spreadsheet) -> None:
+    def stage_results(self, report_writer: ReportWriter) -> None:
         """
         Results Table Template
             1           2       3       4       ...
@@ -468,119 +693,257 @@ class GauntletTournament(Tournament):
         3   entrant_name score1  score2  score3
         N
         """
-        worksheet = spreadsheet.worksheet(self.name)
-        row = 1
-        self._write_results_header_to_worksheet(worksheet, row)
+        self.resolve_eligibility()
+        grid: Grid = [self._render_results_header()]
         for entrant in self.entrants:
             if entrant.has_scores and entrant.can_compete:
-                row += 1
-                self._write_results_row_to_worksheet(worksheet, row, entrant)
+                grid.append(self._render_results_row(entrant))
         for entrant in self.entrants:
             if entrant.has_scores and not entrant.can_compete:
-                row += 1
-                self._write_results_row_to_worksheet(worksheet, row, entrant)
+                grid.append(self._render_results_row(entrant))
+        report_writer.stage(self.name, grid)
 
 
     # Additional public methods
     def filter_songs_and_charts(self, gauntlet_json: list[dict]) -> None:
-        filtered_songs = []
-        filtered_charts = []
-        for filter_ in gauntlet_json:
-            [song] = [
-                song for song in self.songs 
-                if song.title.casefold() == str(filter_["title"]).casefold()
-                or song.subtitle.casefold() == str(filter_["title"]).casefold()
-            ]
-            filtered_songs.append(song)
-            
-            filtered_charts.extend([
-                chart for chart in self.charts
-                if chart.song_id == song.id
-                and chart.difficulty == filter_["difficulty"]
-                and chart.difficulty_name.casefold().startswith(
-                    str(filter_["difficulty_name"]).casefold()
-                )
-            ])
-        self.songs = filtered_songs
-        self.charts = filtered_charts
-
-
-    def _write_results_header_to_worksheet(self, worksheet: Worksheet, row: int) -> None:
-        cells = []
-        col = 2
-        cells.append(Cell(row, col, "Eligible for Ranking"))
-        col += 1
-        for song in self.songs:
-            cells.append(Cell(row, col, song.title))
-            col += 1
-        worksheet.update_cells(cells)
-
-    def _write_results_row_to_worksheet(self, worksheet: Worksheet, row, entrant: Entrant) -> None:
-        cells = []
-        col = 1 
-        cells.append(Cell(row, col, entrant.name))
-        col += 1
-        cells.append(Cell(row, col, str(entrant.can_compete)))
-        for chart in self.charts:
-            col += 1
-            any_score = [score for score in entrant.scores if score.chart.id == chart.id]
-            if not any_score:
-                cells.append(Cell(row, col, str(0)))
-            else:
-                cells.append(Cell(row, col, str(any_score[0].score)))
-        worksheet.update_cells(cells)
+        """
+        Restrict the Tournament to the configured charts, in config order
+
+        :param gauntlet_json: Chart configs with title, difficulty and difficulty_name
+        :type gauntlet_json: list[dict]
+        :raises ValueError: If a title is unknown or ambiguous, or a config matches no single chart
+        """
+        self.songs, self.charts = self.score_fetcher.catalog.resolve_charts(gauntlet_json)
+
+    def score_matrix(self, eligible_only: bool = True) -> tuple[list[Entrant], "np.ndarray"]:
+        """
+        Entrant x chart matrix of counted scores, 0 where an entrant has none
+
+        Rows are the entrants with scores, eligible entrants first, like the results worksheet
+
+        :param eligible_only: Leave out entrants who cannot compete
+        :type eligible_only: bool
+        :return: Entrants in row order, and their scores in chart order
+        :rtype: tuple[list[Entrant], np.ndarray]
+        """
+        import numpy as np
+
+        self.resolve_eligibility()
+        entrants = [entrant for entrant in self.entrants if entrant.has_scores and entrant.can_compete]
+        if not eligible_only:
+            entrants += [entrant for entrant in self.entrants if entrant.has_scores and not entrant.can_compete]
+        column = {chart.id: index for index, chart in enumerate(self.charts)}
+        scores = np.zeros((len(entrants), len(self.charts)), dtype=np.int64)
+        for row, entrant in enumerate(entrants):
+            for score in entrant.scores:
+                if score.chart.id in column:
+                    scores[row, column[score.chart.id]] = score.score
+        return entrants, scores
+
+    def rank_point_results(self, eligible_only: bool = True) -> list[tuple[str, float]]:
+        """
+        Final standings by rank points, highest first (ties keep results worksheet order)
+
+        On each ranked chart, entrants earn points by their placement among everyone ranked,
+            along `rank_point_curve`, with ties placed by `rank_point_ties`. Computed in
+            one vectorized pass over the entrant x chart score matrix, see src.rank_points.
+
+        :param eligible_only: Rank only entrants who can compete, otherwise everyone with scores
+        :type eligible_only: bool
+        :return: (entrant name, total rank points)
+        :rtype: list[tuple[str, float]]
+        """
+        import numpy as np
+        from src.rank_points import SCORE_CALC_COEFFICIENTS, SCORE_CALC_SCALE, polynomial_curve, rank_points
+
+        entrants, scores = self.score_matrix(eligible_only=eligible_only)
+        if self.rank_point_curve is not None:
+            curve = polynomial_curve(self.rank_point_curve)
+        else:
+            curve = polynomial_curve(SCORE_CALC_COEFFICIENTS, SCORE_CALC_SCALE)
+        totals = rank_points(scores[:, :self.ranked_charts], curve, self.rank_point_ties).sum(axis=1)
+        order = np.argsort(-totals, kind="stable")
+        return [(entrants[index].name, float(totals[index])) for index in order]
+
 
+    def _render_results_header(self) -> list[str | None]:
+        return [None, "Eligible for Ranking"] + [song.title for song in self.songs]
+
+    def _render_results_row(self, entrant: Entrant) -> list[str | None]:
+        best_scores = {score.chart.id: score.score for score in entrant.scores}
+        return [entrant.name, str(entrant.can_compete)] + [
+            str(best_scores.get(chart.id, 0))
+            for chart in self.charts
+        ]
+
+
+
+
+@dataclass(slots=True)
+class TeamAssignment:
+    team: list[str]
+    total: int
+    players: list[str]  # player assigned to each chart, in chart order
+    scores: list[int]  # score counted on each chart
 
 
+class GroupTournament(GauntletTournament):
+    """
+    Team matches over a gauntlet's charts, each chart counting one player's score
+
+    Each team's players split the charts between them, every player playing at most their
+        quota (an even split by default), and the team scores the sum of the chosen players'
+        best scores. The split maximizing that sum is found exactly as an assignment problem.
+    """
+    def __init__(
+        self,
+        name: str,
+        start_date: datetime,
+        end_date: datetime,
+        attempts_to_count: int,
+        teams: list[list[str]] | None = None,
+        quotas: dict[str, int] | None = None,
+        team_results_sheet_name: str | None = None,
+        ineligible_requirements: list[EligibilityConfig] | None = None,
+        ranked_charts: int | None = None,
+        rank_point_curve: list[float] | None = None,
+        rank_point_ties: str = "shared",
+        score_fetcher: ScoreFetcher | None = None,
+        score_pool: ScorePool | None = None,
+    ):
+        super().__init__(
+            name=name,
+            start_date=start_date,
+            end_date=end_date,
+            attempts_to_count=attempts_to_count,
+            ineligible_requirements=ineligible_requirements,
+            ranked_charts=ranked_charts,
+            rank_point_curve=rank_point_curve,
+            rank_point_ties=rank_point_ties,
+            score_fetcher=score_fetcher,
+            score_pool=score_pool,
+        )
+        self.teams = teams if teams else []
+        self.quotas = quotas if quotas else {}  # charts per player, where not an even split
+        self.team_results_sheet_name = (
+            team_results_sheet_name if team_results_sheet_name else f"{name} Teams"
+        )
+
+    @classmethod
+    def from_config_file(
+        cls,
+        config_filepath: Path,
+        entrant_filepath: Path,
+        score_fetcher: ScoreFetcher | None = None,
+        score_pool: ScorePool | None = None,
+    ) -> "GroupTournament":
+        """
+        Create a GroupTournament from a match config with a "teams" list, and loads entrants
+        """
+        tournament = super().from_config_file(
+            config_filepath=config_filepath,
+            entrant_filepath=entrant_filepath,
+            score_fetcher=score_fetcher,
+            score_pool=score_pool,
+        )
+        base_dict: dict = load_config_file(config_filepath)
+        config: dict = base_dict["config"]
+        tournament.teams = base_dict.get("teams", [])
+        tournament.quotas = config.get("quotas", {})
+        if config.get("team_results_sheet_name"):
+            tournament.team_results_sheet_name = config["team_results_sheet_name"]
+        return tournament
+
+    def quotas_for(self, team: list[str]) -> list[int]:
+        """
+        Most charts each player of the team may play, in team order
+
+        Players without a configured quota split the remaining charts evenly,
+            the earlier players taking any remainder
+        """
+        remaining = len(self.charts) - sum(self.quotas.get(player, 0) for player in team)
+        unset = [player for player in team if player not in self.quotas]
+        quotas = []
+        for player in team:
+            if player in self.quotas:
+                quotas.append(self.quotas[player])
+                continue
+            index = unset.index(player)
+            quotas.append(max(remaining, 0) // len(unset) + (index < max(remaining, 0) % len(unset)))
+        return quotas
+
+    def solve_team(self, team: list[str]) -> TeamAssignment:
+        """
+        Best assignment of the team's players to the charts, from their counted scores
+
+        :param team: Entrant names of the team
+        :type team: list[str]
+        :raises ValueError: If the team's quotas cover fewer charts than the Tournament has
+        """
+        entrants = {entrant.name.casefold(): entrant for entrant in self.entrants}
+        scores = []
+        for player in team:
+            entrant = entrants.get(player.casefold())
+            best_scores = {score.chart.id: score.score for score in entrant.scores} if entrant else {}
+            scores.append([best_scores.get(chart.id, 0) for chart in self.charts])
+        total, players = assign_charts(scores, self.quotas_for(team))
+        return TeamAssignment(
+            team=team,
+            total=total,
+            players=[team[player] for player in players],
+            scores=[scores[player][chart] for chart, player in enumerate(players)],
+        )
+
+    def team_results(self) -> list[TeamAssignment]:
+        """
+        Every team's best assignment, highest total first
+        """
+        return sorted((self.solve_team(team) for team in self.teams), key=lambda result: -result.total)
+
+    def stage_results(self, report_writer: ReportWriter) -> None:
+        """
+        Per entrant results like a GauntletTournament, and on a second worksheet:
+
+        Team Results Template
+            1           2       3                   4                   ...
+        1   <empty>     Total   song1               song2               ...
+        2   team        total   player1 (score1)    player2 (score2)
+        N
+        """
+        super().stage_results(report_writer)
+        grid: Grid = [[None, "Total"] + [song.title for song in self.songs]]
+        for result in self.team_results():
+            grid.append([" / ".join(result.team), str(result.total)] + [
+                f"{player} ({score})"
+                for player, score in zip(result.players, result.scores)
+            ])
+        report_writer.stage(self.team_results_sheet_name, grid)
+
 
 # print info about multiple tournament eligibilities
 def make_eligibility_spreadsheet_for_gauntlet_tournaments(
-    result_spreadsheet: Spreadsheet,
+    result_spreadsheet: "Spreadsheet",
     tournaments: list[Tournament],
     worksheet_name: str = "Bracket Eligibility",
+    report_writer: ReportWriter | None = None,
 ):
-    worksheet = result_spreadsheet.worksheet(worksheet_name)
-    cells = []
-    col = 1
-    row = 2
+    for tournament in tournaments:
+        if isinstance(tournament, GauntletTournament):
+            tournament.resolve_eligibility()
+    grid: Grid = [[None] + [tournament.name for tournament in tournaments]]  # tournament names
     for entrant in tournaments[0].entrants:  # player names
-        cells.append(Cell(row, col, entrant.name))
-        row += 1
-    col = 2
+        grid.append([entrant.name])
     for tournament in tournaments:  # tournament eligibilities
         row = 1
-        cells.append(Cell(row, col, tournament.name))
-        row += 1
         for entrant in tournament.entrants:
-            cells.append(Cell(row, col, str(entrant.can_compete)))
+            grid[row].append(str(entrant.can_compete))
             row += 1
-        col += 1
-    worksheet.update_cells(cells)
-    
-    # conditional formatting
-    red_rule = gsf.ConditionalFormatRule(
-        ranges=[gsf.GridRange.from_a1_range('A1:F2000', worksheet)],
-        booleanRule=gsf.BooleanRule(
-            condition=gsf.BooleanCondition('TEXT_EQ', [str(False)]),
-            format=gsf.CellFormat(
-                textFormat=gsf.TextFormat(bold=True),
-                backgroundColor=gsf.Color.fromHex("#e67c73")
-            ),
-        ),
-    )
-    green_rule = gsf.ConditionalFormatRule(
-        ranges=[gsf.GridRange.from_a1_range('A1:F2000', worksheet)],
-        booleanRule=gsf.BooleanRule(
-            condition=gsf.BooleanCondition('TEXT_EQ', [str(True)]),
-            format=gsf.CellFormat(
-                textFormat=gsf.TextFormat(bold=True),
-                backgroundColor=gsf.Color.fromHex("#57bb8a"),
-            ),
-        ),
-    )
-    rules = gsf.get_conditional_format_rules(worksheet)
-    rules.clear()
-    rules.append(red_rule)
-    rules.append(green_rule)
-    rules.save()
-    gsf.set_frozen(worksheet, rows=1, cols=1)
+    # ineligible entrants in red, eligible ones in green
+    conditional_formats = [
+        ConditionalFormat("A1:F2000", "TEXT_EQ", [str(False)], background="#e67c73", bold=True),
+        ConditionalFormat("A1:F2000", "TEXT_EQ", [str(True)], background="#57bb8a", bold=True),
+    ]
+    writer = report_writer if report_writer is not None else ReportWriter()
+    writer.stage(worksheet_name, grid, frozen_rows=1, frozen_cols=1, conditional_formats=conditional_formats)
+    if report_writer is None:
+        writer.flush(result_spreadsheet)
@@ -0,0 +1,89 @@
+def solve_assignment(cost: list[list[float]]) -> list[int]:
+    """
+    Minimum cost assignment of every row to a distinct column (Hungarian algorithm)
+
+    Runs in O(rows^2 * columns), and is exact for integer costs
+
+    :param cost: cost[row][column], with no more rows than columns
+    :type cost: list[list[float]]
+    :return: Column assigned to each row
+    :rtype: list[int]
+    :raises ValueError: If there are more rows than columns
+    """
+    num_rows = len(cost)
+    num_cols = len(cost[0]) if cost else 0
+    if num_rows > num_cols:
+        raise ValueError(f"Cannot assign {num_rows} rows to {num_cols} columns")
+
+    # 1-based potentials and matching, column 0 is a sentinel
+    row_potential = [0] * (num_rows + 1)
+    col_potential = [0] * (num_cols + 1)
+    row_of_col = [0] * (num_cols + 1)
+    previous_col = [0] * (num_cols + 1)
+    for row in range(1, num_rows + 1):
+        # grow a shortest augmenting path from the new row to a free column
+        row_of_col[0] = row
+        col = 0
+        slack = [float("inf")] * (num_cols + 1)
+        visited = [False] * (num_cols + 1)
+        while True:
+            visited[col] = True
+            current_row = row_of_col[col]
+            delta = float("inf")
+            next_col = 0
+            for candidate in range(1, num_cols + 1):
+                if visited[candidate]:
+                    continue
+                reduced = cost[current_row - 1][candidate - 1] - row_potential[current_row] - col_potential[candidate]
+                if reduced < slack[candidate]:
+                    slack[candidate] = reduced
+                    previous_col[candidate] = col
+                if slack[candidate] < delta:
+                    delta = slack[candidate]
+                    next_col = candidate
+            for candidate in range(num_cols + 1):
+                if visited[candidate]:
+                    row_potential[row_of_col[candidate]] += delta
+                    col_potential[candidate] -= delta
+                else:
+                    slack[candidate] -= delta
+            col = next_col
+            if row_of_col[col] == 0:
+                break
+        # flip the matching along the path
+        while col:
+            prior = previous_col[col]
+            row_of_col[col] = row_of_col[prior]
+            col = prior
+
+    assignment = [-1] * num_rows
+    for col in range(1, num_cols + 1):
+        if row_of_col[col]:
+            assignment[row_of_col[col] - 1] = col - 1
+    return assignment
+
+
+def assign_charts(scores: list[list[int]], quotas: list[int]) -> tuple[int, list[int]]:
+    """
+    Best team total when each chart is played by one player, within each player's quota
+
+    Each player is split into `quota` identical slots, so charts and slots form a plain
+        assignment problem. When the quotas add up to the number of charts, each player
+        plays exactly their quota.
+
+    :param scores: scores[player][chart], 0 where a player has no score
+    :type scores: list[list[int]]
+    :param quotas: Most charts each player may play
+    :type quotas: list[int]
+    :return: Best total, and the player index assigned to each chart
+    :rtype: tuple[int, list[int]]
+    :raises ValueError: If the quotas cover fewer charts than there are
+    """
+    num_charts = len(scores[0]) if scores else 0
+    slots = [player for player, quota in enumerate(quotas) for _ in range(quota)]
+    if len(slots) < num_charts:
+        raise ValueError(f"Quotas {quotas} cover {len(slots)} of {num_charts} charts")
+    cost = [[-scores[player][chart] for player in slots] for chart in range(num_charts)]
+    players = [slots[slot] for slot in solve_assignment(cost)]
+    total = sum(scores[player][chart] for chart, player in enumerate(players))
+    return total, players
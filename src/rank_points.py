@@ -0,0 +1,108 @@
+from typing import Callable, TextIO
+
+import numpy as np
+
+# y = -0.675x^3 + 1.8x^2 - 2.025x + 1, from 1 at first place down to 0.1 at last place
+SCORE_CALC_COEFFICIENTS = [-0.675, 1.8000000001575, -2.0250000001575, 1.0]
+SCORE_CALC_SCALE = 10  # adjust to [10, 1] from [1, 0.1]
+TIE_RULES = ("shared", "reversed")  # see placements
+
+
+def score_calc(index, max_index):
+    """
+    Points for placing `index` (0 is first) of `max_index + 1` on a chart, on the default curve
+
+    Works on numbers or numpy arrays alike
+    """
+    return polynomial_curve(SCORE_CALC_COEFFICIENTS, SCORE_CALC_SCALE)(np.divide(index, max_index))
+
+
+def polynomial_curve(coefficients: list[float], scale: float = 1.0) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Rank points curve evaluating a polynomial over relative placement
+
+    :param coefficients: Highest power first, as in numpy.polyval
+    :type coefficients: list[float]
+    :param scale: Multiplies every value of the polynomial
+    :type scale: float
+    :return: Maps relative placement, 0 for first to 1 for last, to points
+    :rtype: Callable[[np.ndarray], np.ndarray]
+    """
+    return lambda placement: np.polyval(coefficients, placement) * scale
+
+
+def placements(scores: np.ndarray, ties: str = "shared") -> np.ndarray:
+    """
+    Each score's place within its column, 0 for the highest
+
+    With `ties="shared"`, tied scores share the better place, and the next distinct score skips
+        past them (100, 90, 90, 80 place 0, 1, 1, 3). With `ties="reversed"`, tied scores take
+        consecutive places, later rows first, which is how the 2025 singles results were scored
+        (a descending pandas sort lists tied rows in reverse order).
+
+    :param scores: entrant x chart matrix
+    :type scores: np.ndarray
+    :param ties: "shared" or "reversed"
+    :type ties: str
+    :rtype: np.ndarray
+    :raises ValueError: If `ties` is not a known rule
+    """
+    if ties not in TIE_RULES:
+        raise ValueError(f"Unknown tie rule {ties!r}, expected one of {TIE_RULES}")
+    num_rows = scores.shape[0]
+    positions = np.broadcast_to(np.arange(num_rows)[:, None], scores.shape)
+    if ties == "reversed":
+        order = num_rows - 1 - np.argsort(-scores[::-1], axis=0, kind="stable")
+        places = np.empty_like(order)
+        np.put_along_axis(places, order, positions, axis=0)
+        return places
+    order = np.argsort(-scores, axis=0, kind="stable")
+    ordered = np.take_along_axis(scores, order, axis=0)
+    starts_tie = np.ones(scores.shape, dtype=bool)
+    starts_tie[1:] = ordered[1:] != ordered[:-1]
+    first_of_tie = np.maximum.accumulate(np.where(starts_tie, positions, 0), axis=0)
+    places = np.empty_like(order)
+    np.put_along_axis(places, order, first_of_tie, axis=0)
+    return places
+
+
+def rank_points(
+    scores: np.ndarray,
+    curve: Callable[[np.ndarray], np.ndarray] | None = None,
+    ties: str = "shared",
+) -> np.ndarray:
+    """
+    Points per entrant and chart, from placing on each chart against everyone in `scores`
+
+    Placement is taken relative to the number of entrants, so first place is 0 and last
+        place is 1 on every chart (a lone entrant places first). A score of 0 earns no points.
+
+    :param scores: entrant x chart matrix of scores, 0 where an entrant has none
+    :type scores: np.ndarray
+    :param curve: Maps relative placement to points, score_calc's curve if not given
+    :type curve: Callable[[np.ndarray], np.ndarray] | None
+    :param ties: How tied scores are placed, see placements
+    :type ties: str
+    :return: entrant x chart matrix of points
+    :rtype: np.ndarray
+    """
+    if curve is None:
+        curve = polynomial_curve(SCORE_CALC_COEFFICIENTS, SCORE_CALC_SCALE)
+    scores = np.asarray(scores)
+    if scores.size == 0:
+        return np.zeros(scores.shape)
+    max_place = max(scores.shape[0] - 1, 1)
+    return np.where(scores > 0, curve(placements(scores, ties) / max_place), 0.0)
+
+
+def write_results(file: TextIO, sections: dict[str, list[tuple[str, float]]]):
+    """
+    Write standings like final_results.tsv: a title line per section, then one
+        "entrant<TAB>points" line per entrant, with a blank line between sections
+    """
+    for index, (title, standings) in enumerate(sections.items()):
+        if index:
+            file.write("\n")
+        file.write(f"{title}\n")
+        for entrant_name, points in standings:
+            file.write(f"{entrant_name}\t{round(points, 1)}\n")